@@ -0,0 +1,41 @@
+"""
+Helpers shared by the benchmarks: timing, the reference-versus-new comparison and
+command-line parsing. The reference_* functions in each benchmark are the original
+implementations the new code must reproduce.
+"""
+
+import sys
+import time
+import pandas as pd
+
+
+def timed(fn, *args):
+    """(fn(*args), seconds it took)."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def repeated(df, repeat):
+    """df concatenated with itself `repeat` times, to measure larger inputs."""
+    return pd.concat([df] * repeat, ignore_index=True) if repeat > 1 else df
+
+
+def compare(reference, candidate, args, check, describe, label="vectorized"):
+    """
+    Runs reference(*args) and candidate(*args), asserts with check(expected, actual) that both
+    give the same result, and prints describe(actual) with both timings and the speedup.
+    Returns the candidate's result.
+    """
+    expected, reference_seconds = timed(reference, *args)
+    actual, candidate_seconds = timed(candidate, *args)
+    check(expected, actual)
+    print(f"{describe(actual)} (identical)")
+    print(f"{'reference:':<{len(label) + 2}}{reference_seconds:8.3f}s")
+    print(f"{label + ':':<{len(label) + 2}}{candidate_seconds:8.3f}s  ({reference_seconds / candidate_seconds:.1f}x)")
+    return actual
+
+
+def int_args(default=None):
+    """The integer command-line arguments, or [default] when there are none."""
+    return [int(a) for a in sys.argv[1:]] or [default]
@@ -0,0 +1,75 @@
+"""
+Benchmark for the startup name normalizer and the location, region and founding-date
+cleaners used by clean_merge_startups against the original row-wise versions. Checks that both give
+the same values on the YC data and reports the speedup.
+
+    python -m benchmarks.bench_clean_startups [repeat]
+
+repeat concatenates the data with itself to measure larger inputs.
+"""
+
+import re
+import pandas as pd
+
+from benchmarks._common import compare, int_args, repeated
+from src.clean_data import region_map, extract_country, map_region, unify_founding_date, parse_dates
+from src.startup_schema import normalise_names
+
+
+# The original per-row implementations
+def reference_normalise(name):
+    if pd.isnull(name):
+        return ""
+    return re.sub(r'[^a-z0-9]', '', name.lower())
+
+
+def reference_extract_country(location):
+    if pd.isna(location):
+        return None
+    parts = [p.strip() for p in location.split(',')]
+    return parts[-1] if parts else None
+
+
+def reference_unify_founding_date(row):
+    for col in ['founded_at', 'founded_date', 'first_funding_at', 'founded']:
+        val = row.get(col, None)
+        if pd.notnull(val) and str(val).strip() != '':
+            if col == 'founded':
+                try:
+                    year = int(val)
+                    return f"{year}-01-01"
+                except (ValueError, TypeError):
+                    return None
+            return str(val)
+    return None
+
+
+def reference_clean(startups_df):
+    name = startups_df["name"].apply(reference_normalise)
+    country = startups_df["location"].apply(reference_extract_country)
+    region = country.map(region_map).fillna("Unknown")
+    founding_date = startups_df.apply(reference_unify_founding_date, axis=1)
+    return name, country, region, founding_date, pd.to_datetime(founding_date, errors="coerce")
+
+
+def vectorized_clean(startups_df):
+    name = normalise_names(startups_df["name"])
+    country = extract_country(startups_df["location"])
+    founding_date = unify_founding_date(startups_df)
+    return name, country, map_region(country), founding_date, parse_dates(founding_date)
+
+
+def main(repeat=1):
+    startups_df = pd.read_csv("data/ycombinator_startups_res.csv")
+    startups_df["location"] = startups_df["region"]
+    startups_df = repeated(startups_df, repeat)
+
+    def check(expected, actual):
+        for e, a in zip(expected, actual):
+            pd.testing.assert_series_equal(e, a, check_names=False, check_dtype=False)
+
+    compare(reference_clean, vectorized_clean, (startups_df,), check, lambda _: f"{len(startups_df)} startups")
+
+
+if __name__ == "__main__":
+    main(*int_args(1))
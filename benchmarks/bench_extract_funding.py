@@ -0,0 +1,98 @@
+"""
+Benchmark for extract_funding_total_and_currency against the original row-wise apply
+on the Brightdata Crunchbase sample. Checks that both produce the same funding amount
+and currency for every company and reports the speedup.
+
+    python -m benchmarks.bench_extract_funding [repeat]
+
+repeat concatenates the sample with itself to measure larger inputs.
+"""
+
+import pandas as pd
+
+from benchmarks._common import compare, int_args, repeated
+from src.cache import read_cache
+from src.clean_data import extract_funding_total_and_currency
+
+BRIGHTDATA_PATH = "data/crunchbase-companies-information.csv"
+BRIGHTDATA_URL = "https://raw.githubusercontent.com/luminati-io/Crunchbase-dataset-samples/main/crunchbase-companies-information.csv"
+
+
+def reference_extract_funding_total_and_currency(row):
+    """
+    The original per-row extractor.
+    Extracts the most accurate funding_total and funding_currency for a Crunchbase company row.
+    Priority:
+    1. funds_total 
+    2. financials_highlights 
+    3. funding_rounds
+    """
+    import json
+    # 1. funds_total
+    if "funds_total" in row and pd.notnull(row["funds_total"]) and row["funds_total"] != "":
+        try:
+            data = json.loads(row["funds_total"])
+            if isinstance(data, dict) and "value_usd" in data:
+                return data["value_usd"], data.get("currency", "USD")
+        except Exception:
+            pass
+    # 2. financials_highlights
+    if "financials_highlights" in row and pd.notnull(row["financials_highlights"]) and row["financials_highlights"] != "":
+        try:
+            data = json.loads(row["financials_highlights"])
+            # If top-level has value_usd
+            if isinstance(data, dict):
+                if "value_usd" in data:
+                    return data["value_usd"], data.get("currency", "USD")
+                # If nested under "funding_total"
+                if "funding_total" in data and isinstance(data["funding_total"], dict):
+                    funding = data["funding_total"]
+                    if "value_usd" in funding:
+                        return funding["value_usd"], funding.get("currency", "USD")
+        except Exception:
+            pass
+    # 3. funding_rounds
+    if "funding_rounds" in row and pd.notnull(row["funding_rounds"]) and row["funding_rounds"] != "":
+        try:
+            data = json.loads(row["funding_rounds"])
+            if isinstance(data, dict) and "value" in data and isinstance(data["value"], dict):
+                value_dict = data["value"]
+                if "value_usd" in value_dict:
+                    return value_dict["value_usd"], value_dict.get("currency", "USD")
+        except Exception:
+            pass
+    return None, None
+
+
+def reference_extract_funding(cb_info_df):
+    extracted = cb_info_df.apply(lambda row: reference_extract_funding_total_and_currency(row), axis=1)
+    df = pd.DataFrame(extracted.tolist(), index=cb_info_df.index, columns=["amount", "currency"])
+    return pd.to_numeric(df["amount"], errors="coerce"), df["currency"]
+
+
+def vectorized_extract_funding(cb_info_df):
+    amount, currency = extract_funding_total_and_currency(cb_info_df)
+    return pd.to_numeric(amount, errors="coerce"), currency
+
+
+def _load_sample():
+    try:
+        return read_cache(BRIGHTDATA_PATH, low_memory=False, keep_default_na=False)
+    except FileNotFoundError:
+        return pd.read_csv(BRIGHTDATA_URL, low_memory=False)
+
+
+def main(repeat=1):
+    cb_info_df = _load_sample()
+    cb_info_df = repeated(cb_info_df, repeat)
+
+    def check(expected, actual):
+        pd.testing.assert_series_equal(expected[0], actual[0], check_names=False)
+        pd.testing.assert_series_equal(expected[1], actual[1], check_names=False, check_dtype=False)
+
+    compare(reference_extract_funding, vectorized_extract_funding, (cb_info_df,), check,
+            lambda actual: f"{len(cb_info_df)} companies, {actual[0].notna().sum()} with funding")
+
+
+if __name__ == "__main__":
+    main(*int_args(1))
@@ -0,0 +1,55 @@
+"""
+Benchmark for load_graph: reports rows/sec for every node and edge type.
+
+Builds the graph frames from the cached CSVs in data/ and loads them into the
+Neo4j instance configured by NEO4J_URI / NEO4J_USER / NEO4J_PASSWORD.
+
+    python -m benchmarks.bench_load_graph [batch_size ...]
+"""
+
+import pandas as pd
+
+from benchmarks._common import int_args
+from src.clean_data import ingest_papers, clean_arxiv, iter_paper_authors
+from src.load_to_neo4j import load_graph, BATCH_SIZE
+from src.startup_schema import normalise_names
+
+
+def build_frames():
+    tech_df = pd.read_csv("data/wikidata_techs_res.csv")
+    papers = ingest_papers(pd.read_csv("data/arxiv_papers_res.csv"))
+    paper_df = clean_arxiv(papers)
+    paper_authors_df = pd.concat(iter_paper_authors(papers), ignore_index=True)
+    edge_df = pd.read_csv("data/matches_tech_paper.csv")
+
+    startups_df = pd.read_csv("data/ycombinator_startups_res.csv")
+    startups_df["original_name_yc"] = startups_df["name"]
+    startups_df["name"] = normalise_names(startups_df["name"])
+    startups_df = startups_df.drop_duplicates(subset=["name"])
+    startups_df["founded_date_parsed"] = pd.to_datetime(
+        startups_df["founded"].dropna().astype(int).astype(str) + "-01-01", errors="coerce"
+    )
+
+    matches_df = pd.concat([
+        pd.read_csv("data/matches_tech_startup.csv"),
+        pd.read_csv("data/matches_tech_cbinfo.csv"),
+    ], ignore_index=True)
+    startup_skills_df = pd.read_csv("data/startup_skills.csv")
+    return (tech_df, paper_df, edge_df, startups_df, matches_df, startup_skills_df), paper_authors_df
+
+
+def main(batch_sizes):
+    frames, paper_authors_df = build_frames()
+    for batch_size in batch_sizes:
+        print(f"\nbatch_size={batch_size}")
+        stats = load_graph(*frames, LOAD_SKILLS=True, paper_authors_df=paper_authors_df, batch_size=batch_size)
+        print(f"{'entity':<12}{'rows':>8}{'seconds':>10}{'rows/sec':>12}")
+        for entity, s in stats.items():
+            print(f"{entity:<12}{s['rows']:>8}{s['seconds']:>10.2f}{s['rows_per_sec']:>12.0f}")
+        total_rows = sum(s["rows"] for s in stats.values())
+        total_seconds = sum(s["seconds"] for s in stats.values())
+        print(f"{'total':<12}{total_rows:>8}{total_seconds:>10.2f}{total_rows / total_seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+    main(int_args(BATCH_SIZE))
@@ -0,0 +1,73 @@
+"""
+Benchmark for match_startups_to_techs against the original per-row, per-synonym loop.
+Checks that both produce the same matches and reports the speedup.
+
+    python -m benchmarks.bench_match_startups [n_startups]
+"""
+
+import re
+import pandas as pd
+from rapidfuzz import fuzz
+
+from benchmarks._common import compare, int_args
+from src.clean_data import TECH_SYNONYMS, match_startups_to_techs
+from src.startup_schema import normalise_names
+
+
+def reference_match_startups_to_techs(startups_df, techs_df, text_columns=None, threshold=85):
+    """The original per-row, per-synonym implementation."""
+    matches = []
+    synonym_to_canonical_qid = {}
+    for _, tech in techs_df.iterrows():
+        tech_name = tech['name']
+        qid = tech.get('qid', None)
+        for synonym in TECH_SYNONYMS.get(tech_name, [tech_name]):
+            synonym_to_canonical_qid[synonym.lower()] = (tech_name, qid)
+
+    if text_columns is None:
+        text_columns = ['long_description', 'industry', 'short_description', 'tags', 'name']
+
+    for idx, row in startups_df.iterrows():
+        text = " ".join([str(row.get(col, '')) for col in text_columns])
+        text_lower = text.lower()
+        for synonym, (canonical, qid) in synonym_to_canonical_qid.items():
+            clean_synonym = synonym.strip()
+            words = clean_synonym.split()
+            dynamic_threshold = 95 if any(len(w) <= 4 for w in words) else threshold
+            if len(clean_synonym) <= 3:
+                if re.search(rf"\b{re.escape(clean_synonym)}\b", text, re.IGNORECASE):
+                    score = 100
+                else:
+                    score = 0
+            else:
+                score = fuzz.token_set_ratio(clean_synonym.lower(), text_lower)
+            if score >= dynamic_threshold and qid is not None:
+                matches.append({
+                    "startup_name": row.get("name"),
+                    "technology": canonical,
+                    "qid": qid,
+                    "score": score
+                })
+    matches_df = pd.DataFrame(matches)
+    matches_df = matches_df.sort_values("score", ascending=False).drop_duplicates(subset=["startup_name", "technology"], keep="first")
+    return matches_df
+
+
+def main(n_startups=None):
+    techs_df = pd.read_csv("data/wikidata_techs_res.csv")
+    startups_df = pd.read_csv("data/ycombinator_startups_res.csv")
+    startups_df["name"] = normalise_names(startups_df["name"])
+    if n_startups:
+        startups_df = startups_df.head(n_startups)
+
+    def check(expected, actual):
+        pd.testing.assert_frame_equal(
+            expected.reset_index(drop=True), actual.reset_index(drop=True), check_dtype=False
+        )
+
+    compare(reference_match_startups_to_techs, match_startups_to_techs, (startups_df, techs_df), check,
+            lambda actual: f"{len(startups_df)} startups, {len(actual)} matches", label="batched")
+
+
+if __name__ == "__main__":
+    main(*int_args())
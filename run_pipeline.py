@@ -1,22 +1,36 @@
 # Top level orchestration script for running the pipeline
+#
+# Every step is a stage of a small DAG (see src/pipeline.py) that reads and writes the cached
+# artifacts in data/. Stages whose inputs did not change are skipped, independent stages run
+# in parallel, and single stages can be rerun:
+#
+#     python run_pipeline.py                         # everything that is out of date
+#     python run_pipeline.py --only papers           # just that stage
+#     python run_pipeline.py --from merge_startups   # that stage and everything downstream
 
 
+import argparse
 import pandas as pd
 import os
-import time
 import json
-import random
-from neo4j import GraphDatabase
 from dotenv import load_dotenv
 
-from src.get_arxiv import fetch_arxiv, parse_et
+from src.get_arxiv import stream_arxiv
 from src.get_crunchbase import fetch_crunchbase
 from src.get_wikidata import fetch_wikidata
-from src.clean_data import match_papers_to_tech, match_startups_to_techs, clean_arxiv, clean_merge_startups, extract_skills_from_roles, clean_skills, startup_name_normalization
+from src.clean_data import match_papers_to_tech, match_startups_to_techs, ingest_papers, clean_arxiv, iter_paper_authors, clean_merge_startups, extract_skills_from_roles, clean_skills, startup_name_normalization, MATCH_CACHE_YC_FILE, MATCH_CACHE_CB_INFO_FILE, PAPER_COLUMNS
 from src.load_to_neo4j import load_graph
+from src.neo4j_bulk_import import write_import_files, run_import
+from src.neo4j_sync import sync_graph
+from src.neo4j_connection import wait_until_ready
+from src.cache import read_cache, write_cache, CacheWriter, exists as cache_exists
+from src.startup_schema import read_startups
+from src.pipeline import Stage, run_stages
+from src.instrumentation import write_report
 
 
 from src.get_jobboard import fetch_jobboard, fetch_kaggle
+from src.jobboard_queue import scrape_jobboard
 
 
 load_dotenv()
@@ -35,19 +49,18 @@ tech_startup_csv_path = "data/matches_tech_startup.csv"
 tech_paper_csv_path = "data/matches_tech_paper.csv"
 emerging_technologies_file = os.getenv("EMERGING_TECHS", "data/emerging_techs.json")
 
-def wait_for_neo4j(uri, user, pwd, max_retries=10, delay=2):
-    for i in range(max_retries):
-        try:
-            driver = GraphDatabase.driver(uri, auth=(user, pwd))
-            with driver.session() as session:
-                session.run("RETURN 1")
-            print("✓ Neo4j is ready!")
-            return
-        except Exception as e:
-            print(f"Waiting for Neo4j to be ready... ({i+1}/{max_retries})")
-            time.sleep(delay)
-    raise RuntimeError("Neo4j did not become ready in time.")
+# Intermediate artifacts passed between stages (Parquet only, not shipped in data/)
+yc_normalized_path = "data/ycombinator_startups_normalized.csv"
+crunchbase_normalized_path = "data/crunchbase_startups_normalized.csv"
+brightdata_normalized_path = "data/crunchbase-companies-information_normalized.csv"
+all_startups_path = "data/all_startups.csv"
+papers_path = "data/arxiv_papers_clean.csv"
+paper_authors_path = "data/paper_authors.csv"
 
+# read_csv options for the one-time CSV -> Parquet migration of caches that need them
+csv_read_options = {
+    brightdata_path: {"low_memory": False, "keep_default_na": False},
+}
 
 # Check all cached data files exist or fail with error
 def check_cache_files():
@@ -61,9 +74,9 @@ def check_cache_files():
         startup_skills_csv_path,
         techcb_startup_csv_path
     ]
-    
+
     for file in required_files:
-        if not os.path.exists(file):
+        if not cache_exists(file):
             raise FileNotFoundError(f"Required cache file '{file}' does not exist. Set USE_CACHE to False to fetch fresh data.")
 
 
@@ -76,161 +89,232 @@ def get_bool_env(var, prompt, default):
     except EOFError:
         return default
 
-USE_CACHE = get_bool_env("USE_CACHE", "Should we use cached data files? (type \"yes\" on first time run)", True)
-SCRAPE_JOBBOARD = get_bool_env("SCRAPE_JOBBOARD", "Scrape jobboard data? (long running, not recommended. Use cache)", False)
-LOAD_SKILLS = get_bool_env("LOAD_SKILLS", "Load skills from jobboard roles?", False)
-
-# gets a list from json
-with open(emerging_technologies_file, "r", encoding="utf-8") as f:
-    emerging_technologies_json = json.load(f)
-emerging_technologies = list(emerging_technologies_json.keys())
-
-
-if USE_CACHE:
-    print("   NOTICE: Using cached data files. Set USE_CACHE to False to fetch fresh data.")
-    check_cache_files()
-    techs_df = pd.read_csv(wikidata_csv_path)
-    startups_yc = pd.read_csv(yc_csv_path)
-    startups_crunchbase = pd.read_csv(crunchbase_csv_path)
-    arxiv_df = pd.read_csv(arxiv_csv_path)
-    cb_info_df = pd.read_csv(brightdata_path, low_memory=False, keep_default_na=False)
-    final_jobboard_df = pd.read_csv(jobboard_staff_csv_path)
-    kaggle_jobs_skills = pd.read_csv(kaggle_jobs_csv_path)
-    startup_skills_df = pd.read_csv(startup_skills_csv_path)
-    
-    # matches_df = pd.read_csv(tech_startup_csv_path)
-    # edge_df = pd.read_csv(tech_paper_csv_path)
-else:
-    print("   NOTICE: Fetching fresh data...")
-    # Wikidate
+
+def _read(path, **kwargs):
+    return read_cache(path, **kwargs, **csv_read_options.get(path, {}))
+
+
+# --------- FETCH ---------
+def fetch_wikidata_stage(emerging_technologies):
     techs = fetch_wikidata(emerging_technologies)
     techs_df = pd.DataFrame(techs).drop_duplicates(subset="name").sort_values("name").reset_index(drop=True)
-    techs_df.to_csv(wikidata_csv_path, index=False)
+    write_cache(techs_df, wikidata_csv_path, csv=True)
+    print(f"Saved to {wikidata_csv_path} with", len(techs_df), "entries.")
+
+
+def fetch_crunchbase_stage():
     # Crunchbase enrichment and YCombinator data
     startups_yc, startups_crunchbase, cb_info_df = fetch_crunchbase()
-    startups_yc.to_csv(yc_csv_path, index=False)
-    startups_crunchbase.to_csv(crunchbase_csv_path, index=False)
+    write_cache(startups_yc, yc_csv_path, csv=True)
+    write_cache(startups_crunchbase, crunchbase_csv_path, csv=True)
+    write_cache(cb_info_df, brightdata_path, csv=True)
     print(f"Saved Crunchbase startups to {crunchbase_csv_path }, YCombinator startups to {yc_csv_path} and Brightdata info to {brightdata_path}")
-    # Arxiv
-    papers = fetch_arxiv(emerging_technologies)
-    if os.path.exists(arxiv_csv_path):
-        os.remove(arxiv_csv_path)
-    for paper in papers:
-        if paper["response"]:
-            df = parse_et(paper["response"], paper["query"])
-            df.to_csv(arxiv_csv_path, index=False, mode='a', header=not os.path.exists(arxiv_csv_path))
 
 
+def fetch_arxiv_stage(emerging_technologies):
+    # Arxiv: entries are parsed and written to the cache in batches as pages arrive
+    with CacheWriter(arxiv_csv_path, csv=True) as papers_cache:
+        stream_arxiv(emerging_technologies, papers_cache.write)
+    print(f"Saved {papers_cache.rows} arXiv entries to {arxiv_csv_path}")
+
+
+def fetch_kaggle_stage():
+    # Fetch Kaggle job postings and skills
+    kaggle_jobs_skills = fetch_kaggle()
+    write_cache(kaggle_jobs_skills, kaggle_jobs_csv_path, csv=True)
+
 
 # ---------MATCHING ---------
-startups_yc, startups_crunchbase, cb_info_df = startup_name_normalization(startups_yc, startups_crunchbase, cb_info_df)
-# # Print columns in each dataframe for debugging
-# print("Columns in startups_yc:", startups_yc.columns.tolist())
-# print("Columns in startups_crunchbase:", startups_crunchbase.columns.tolist())
-# print("Columns in cb_info_df:", cb_info_df.columns.tolist())
+def normalize_startups_stage():
+    startups_yc, startups_crunchbase, cb_info_df = startup_name_normalization(
+        read_startups(yc_csv_path, "yc"),
+        read_startups(crunchbase_csv_path, "crunchbase"),
+        read_startups(brightdata_path, "cb_info", **csv_read_options.get(brightdata_path, {})),
+    )
+    write_cache(startups_yc, yc_normalized_path)
+    write_cache(startups_crunchbase, crunchbase_normalized_path)
+    write_cache(cb_info_df, brightdata_normalized_path)
 
 
-# Tech to tech matches ???
-#print("Saved to {wikidata_csv_path} with", len(techs_df), "entries.")
+def papers_stage():
+    # The arXiv entries are read and parsed once, then give both the paper nodes and the tech to paper matches
+    papers = ingest_papers(_read(arxiv_csv_path, columns=PAPER_COLUMNS))
+    write_cache(match_papers_to_tech(papers, _read(wikidata_csv_path)), tech_paper_csv_path, csv=True)
+    write_cache(clean_arxiv(papers), papers_path)
+    with CacheWriter(paper_authors_path) as authors_cache:
+        for pairs in iter_paper_authors(papers):
+            authors_cache.write(pairs)
+    print(f"Saved {authors_cache.rows} paper-author pairs to {paper_authors_path}")
 
-# Tech to paper matches
-papers_raw = pd.read_csv(arxiv_csv_path)
-edge_df = match_papers_to_tech(papers_raw, techs_df)
-edge_df.to_csv(tech_paper_csv_path, index=False)
-paper_df = clean_arxiv(papers_raw)
 
-# Tech to startup matches 
-matches_df = match_startups_to_techs(startups_yc, techs_df)
-matches_df.to_csv(tech_startup_csv_path, index=False)
-cb_info_matches_df = match_startups_to_techs(cb_info_df, techs_df, ["about","industries","full_description"])
-cb_info_matches_df.to_csv(techcb_startup_csv_path, index=False)
+def match_yc_stage():
+    # Tech to startup matches
+    matches_df = match_startups_to_techs(_read(yc_normalized_path), _read(wikidata_csv_path), cache_path=MATCH_CACHE_YC_FILE)
+    write_cache(matches_df, tech_startup_csv_path, csv=True)
 
-all_matches_df = pd.concat([matches_df, cb_info_matches_df], ignore_index=True)
-all_matches_df = all_matches_df.sort_values("score", ascending=False).drop_duplicates(subset=["startup_name", "technology"], keep="first")
 
+def match_cb_info_stage():
+    cb_info_matches_df = match_startups_to_techs(_read(brightdata_normalized_path), _read(wikidata_csv_path), ["about","industries","full_description"], cache_path=MATCH_CACHE_CB_INFO_FILE)
+    write_cache(cb_info_matches_df, techcb_startup_csv_path, csv=True)
 
 
-all_startups = clean_merge_startups(startups_yc, startups_crunchbase, cb_info_df)
-# print("Columns in all_startups:", all_startups.columns.tolist())
-# print("FUNDING EXTRACTION: Number of startups with non-null fundings in all_startups:", all_startups['funding_total_usd'].notnull().sum())
-# print("DATE EXTRACTION: Number of startups with non-null dates in all_startups_df:", all_startups['founding_date_final'].notnull().sum())
+def merge_startups_stage():
+    all_startups = clean_merge_startups(_read(yc_normalized_path), _read(crunchbase_normalized_path), _read(brightdata_normalized_path))
+    write_cache(all_startups, all_startups_path)
+    # print("FUNDING EXTRACTION: Number of startups with non-null fundings in all_startups:", all_startups['funding_total_usd'].notnull().sum())
+    # print("DATE EXTRACTION: Number of startups with non-null dates in all_startups_df:", all_startups['founding_date_final'].notnull().sum())
 
 
 # --------- Fetch jobboard staff data ---------
-if SCRAPE_JOBBOARD:
-    # Fetch jobboard staff data from crunchbase companies
-    all_jobboard_staff = []
-    max_staff= 999
-    unique_startups = pd.concat([all_startups['orginal_name']]).dropna().unique()
+def scrape_jobboard_stage():
+    # Scrape jobboard staff data for every startup under its original (un-normalised) name.
+    # Progress is kept in a resumable queue and results are appended as each startup finishes;
+    # the CSV is only replaced when the scrape collected rows, so the Parquet copy below stays in step.
+    all_startups = _read(all_startups_path, columns=["original_name_cb_info", "original_name_yc"])
+    original_names = all_startups['original_name_cb_info'].fillna(all_startups['original_name_yc'])
+    unique_startups = original_names.dropna().unique()
     print(f"\nFound {len(unique_startups)} unique startups to scrape from jobboard.")
-
-    for i, startup_name in enumerate(unique_startups):
-        print(f"Scraping jobboard for '{startup_name}' ({i+1}/{len(unique_startups)})...")
-        try:
-            # Fetch up to max_staff staff members for the current startup
-            jobboard_staff = fetch_jobboard(startup_name, max_staff)
-            if not jobboard_staff.empty:
-                # Overwrite the scraped name with the canonical name from our list
-                # to ensure data consistency.
-                jobboard_staff['start_up'] = startup_name
-                all_jobboard_staff.append(jobboard_staff)
-            
-            # Sleep with a random delay to mimic human behavior and avoid getting blocked
-            sleep_time = random.uniform(5, 15) 
-            print(f"   ... success. Sleeping for {sleep_time:.2f} seconds.")
-            time.sleep(sleep_time)
-
-        except Exception as e:
-            print(f"   ... failed to scrape '{startup_name}': {e}")
-            # Optional: sleep even on failure to be extra cautious
-            time.sleep(5)
-
-    # Combine all the collected staff data into a single DataFrame
-    if all_jobboard_staff:
-        final_jobboard_df = pd.concat(all_jobboard_staff, ignore_index=True)
-        final_jobboard_df.to_csv(jobboard_staff_csv_path, index=False)
+    final_jobboard_df = scrape_jobboard(unique_startups, fetch_jobboard, jobboard_staff_csv_path, max_staff=999)
+    if not final_jobboard_df.empty:
+        write_cache(final_jobboard_df, jobboard_staff_csv_path)
         print(f"\n✓ Successfully scraped and saved staff data for {len(final_jobboard_df['start_up'].unique())} startups.")
     else:
         print("\nNo jobboard staff data was collected.")
-        final_jobboard_df = pd.DataFrame()
-else:
-    print(f"   NOTICE: Skipping jobboard scraping. Pipeline will fail if {jobboard_staff_csv_path} is not available. Set SCRAPE_JOBBOARD to True to fetch fresh data (long running)")
-    if os.path.exists(jobboard_staff_csv_path):
-        final_jobboard_df = pd.read_csv(jobboard_staff_csv_path)
+
+
+# --------- Create Startup Skills ---------
+def startup_skills_stage():
+    if cache_exists(jobboard_staff_csv_path):
+        final_jobboard_df = _read(jobboard_staff_csv_path, columns=["start_up", "current_position", "skills"])
     else:
+        print(f"   NOTICE: {jobboard_staff_csv_path} is not available. Set SCRAPE_JOBBOARD to True to fetch fresh data (long running)")
         final_jobboard_df = pd.DataFrame()
-
-if not USE_CACHE:
-    # Fetch Kaggle job postings and skills
-    kaggle_jobs_skills = fetch_kaggle()
-    kaggle_jobs_skills.to_csv(kaggle_jobs_csv_path, index=False)
-    # --------- Create Startup Skills ---------    
     print("\nMatching jobboard roles to Kaggle skills...")
-    startup_skills_df = extract_skills_from_roles(final_jobboard_df, kaggle_jobs_skills)
-# After loading or generating startup_skills_df, clean the skills
-startup_skills_df = clean_skills(startup_skills_df)
-startup_skills_df.to_csv(startup_skills_csv_path, index=False)
-print(f"✓ Saved {len(startup_skills_df)} startup-skill relationships to {startup_skills_csv_path}")
-
-
-
-
-print(len(all_startups), "ALL startup nodes", )
-print(len(startups_yc), "startup nodes from ycombinator", )
-print(len(startups_crunchbase), "startup nodes from crunchbase", )
-print(len(cb_info_df), "startup nodes from brightdata", )
-print(len(cb_info_matches_df), "startups from brightdata api to tech edges", )
-print(len(matches_df), "startups from yc+crunchbase to tech edges", )
-print(len(techs_df), "tech nodes")
-print(len(paper_df), "paper nodes")
-print(len(edge_df), "paper to tech edges")
+    startup_skills_df = extract_skills_from_roles(final_jobboard_df, _read(kaggle_jobs_csv_path, columns=["job_title", "job_skills"]))
+    startup_skills_df = clean_skills(startup_skills_df)
+    write_cache(startup_skills_df, startup_skills_csv_path, csv=True)
+    print(f"✓ Saved {len(startup_skills_df)} startup-skill relationships to {startup_skills_csv_path}")
+
+
+# --------- LOAD ---------
+def load_stage(load_skills, load_mode):
+    techs_df = _read(wikidata_csv_path)
+    paper_df = _read(papers_path)
+    edge_df = _read(tech_paper_csv_path)
+    paper_authors_df = _read(paper_authors_path)
+    all_startups = _read(all_startups_path)
+    matches_df = _read(tech_startup_csv_path)
+    cb_info_matches_df = _read(techcb_startup_csv_path)
+    startup_skills_df = _read(startup_skills_csv_path, columns=["start_up", "skill", "skill_clean"])
+
+    all_matches_df = pd.concat([matches_df, cb_info_matches_df], ignore_index=True)
+    all_matches_df = all_matches_df.sort_values("score", ascending=False).drop_duplicates(subset=["startup_name", "technology"], keep="first")
+
+    print(len(all_startups), "ALL startup nodes", )
+    print(len(_read(yc_normalized_path, columns=["name"])), "startup nodes from ycombinator", )
+    print(len(_read(crunchbase_normalized_path, columns=["name"])), "startup nodes from crunchbase", )
+    print(len(_read(brightdata_normalized_path, columns=["name"])), "startup nodes from brightdata", )
+    print(len(cb_info_matches_df), "startups from brightdata api to tech edges", )
+    print(len(matches_df), "startups from yc+crunchbase to tech edges", )
+    print(len(techs_df), "tech nodes")
+    print(len(paper_df), "paper nodes")
+    print(len(edge_df), "paper to tech edges")
+    print(len(paper_authors_df), "author to paper edges")
+
+    if load_mode == "bulk":
+        # Offline import files for a fresh database instead of transactional Cypher writes
+        write_import_files(techs_df, paper_df, edge_df, all_startups, all_matches_df, startup_skills_df, load_skills,
+                           paper_authors_df)
+        if run_import():
+            print("✓ Data imported into Neo4j. Start the server and run: python -m src.neo4j_bulk_import schema")
+        return
+
+    # Readiness check on the shared driver, which the schema, load and sync steps then reuse
+    wait_until_ready()
+
+    if load_mode == "sync":
+        sync_graph(techs_df, paper_df, edge_df, all_startups, all_matches_df, startup_skills_df, load_skills, paper_authors_df)
+        print("✓ Neo4j synced with the data")
+        return
+    load_graph(techs_df, paper_df, edge_df, all_startups, all_matches_df, startup_skills_df, load_skills, paper_authors_df)
+    print("✓ Data loaded into Neo4j")
+
+
+def build_stages(emerging_technologies, scrape_jobboard_data, load_skills, load_mode="cypher"):
+    stages = [
+        Stage("fetch_wikidata", fetch_wikidata_stage, outputs=[wikidata_csv_path],
+              params={"emerging_technologies": emerging_technologies}, source=True),
+        Stage("fetch_crunchbase", fetch_crunchbase_stage,
+              outputs=[yc_csv_path, crunchbase_csv_path, brightdata_path], source=True),
+        Stage("fetch_arxiv", fetch_arxiv_stage, outputs=[arxiv_csv_path],
+              params={"emerging_technologies": emerging_technologies}, source=True),
+        Stage("fetch_kaggle", fetch_kaggle_stage, outputs=[kaggle_jobs_csv_path], source=True),
+        Stage("normalize_startups", normalize_startups_stage,
+              inputs=[yc_csv_path, crunchbase_csv_path, brightdata_path],
+              outputs=[yc_normalized_path, crunchbase_normalized_path, brightdata_normalized_path]),
+        Stage("papers", papers_stage, inputs=[arxiv_csv_path, wikidata_csv_path], outputs=[tech_paper_csv_path, papers_path, paper_authors_path]),
+        Stage("match_yc", match_yc_stage, inputs=[yc_normalized_path, wikidata_csv_path], outputs=[tech_startup_csv_path]),
+        Stage("match_cb_info", match_cb_info_stage,
+              inputs=[brightdata_normalized_path, wikidata_csv_path], outputs=[techcb_startup_csv_path]),
+        Stage("merge_startups", merge_startups_stage,
+              inputs=[yc_normalized_path, crunchbase_normalized_path, brightdata_normalized_path], outputs=[all_startups_path]),
+    ]
+    if scrape_jobboard_data:
+        # Prompts for LinkedIn credentials, so it runs in the main process
+        stages.append(Stage("scrape_jobboard", scrape_jobboard_stage, inputs=[all_startups_path],
+                            outputs=[jobboard_staff_csv_path], source=True, in_process=True))
+    stages += [
+        Stage("startup_skills", startup_skills_stage,
+              inputs=[jobboard_staff_csv_path, kaggle_jobs_csv_path], outputs=[startup_skills_csv_path]),
+        Stage("load_graph", load_stage,
+              inputs=[wikidata_csv_path, papers_path, tech_paper_csv_path, paper_authors_path, all_startups_path,
+                      tech_startup_csv_path, techcb_startup_csv_path, startup_skills_csv_path],
+              params={"load_skills": load_skills, "load_mode": load_mode}, in_process=True),
+    ]
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Builds the emerging technology knowledge graph.")
+    parser.add_argument("--only", nargs="+", metavar="STAGE", help="run only these stages")
+    parser.add_argument("--from", dest="start", metavar="STAGE", help="rerun this stage and everything downstream of it")
+    args = parser.parse_args()
+
+    USE_CACHE = get_bool_env("USE_CACHE", "Should we use cached data files? (type \"yes\" on first time run)", True)
+    SCRAPE_JOBBOARD = get_bool_env("SCRAPE_JOBBOARD", "Scrape jobboard data? (long running, not recommended. Use cache)", False)
+    LOAD_SKILLS = get_bool_env("LOAD_SKILLS", "Load skills from jobboard roles?", False)
+    # cypher: batched writes to the running server; sync: only the changes since the last sync;
+    # bulk: neo4j-admin import files for a fresh database
+    LOAD_MODE = os.getenv("LOAD_MODE", "cypher").lower()
+    if LOAD_MODE not in ("cypher", "sync", "bulk"):
+        parser.error(f"LOAD_MODE must be 'cypher', 'sync' or 'bulk', not '{LOAD_MODE}'")
+
+    # gets a list from json
+    with open(emerging_technologies_file, "r", encoding="utf-8") as f:
+        emerging_technologies_json = json.load(f)
+    emerging_technologies = list(emerging_technologies_json.keys())
+
+    stages = build_stages(emerging_technologies, SCRAPE_JOBBOARD, LOAD_SKILLS, LOAD_MODE)
+    force = []
+    if USE_CACHE:
+        print("   NOTICE: Using cached data files. Set USE_CACHE to False to fetch fresh data.")
+        if not (args.only or args.start):
+            check_cache_files()
+    else:
+        print("   NOTICE: Fetching fresh data...")
+        force += [s.name for s in stages if s.source and s.name != "scrape_jobboard"]
+    if SCRAPE_JOBBOARD:
+        force.append("scrape_jobboard")
+    else:
+        print(f"   NOTICE: Skipping jobboard scraping. Set SCRAPE_JOBBOARD to True to fetch fresh data (long running)")
 
-wait_for_neo4j(
-    os.getenv("NEO4J_URI", "bolt://neo4j:7687"),
-    os.getenv("NEO4J_USER", "neo4j"),
-    os.getenv("NEO4J_PASSWORD", "password")
-)
+    try:
+        run_stages(stages, only=args.only, start=args.start, force=force)
+    finally:
+        # Compare two runs with: python -m src.instrumentation OLD_REPORT NEW_REPORT
+        write_report(meta={"only": args.only, "from": args.start, "use_cache": USE_CACHE, "load_skills": LOAD_SKILLS,
+                           "load_mode": LOAD_MODE})
 
 
-load_graph(techs_df, paper_df, edge_df, all_startups, all_matches_df, startup_skills_df, LOAD_SKILLS)
-print("✓ Data loaded into Neo4j")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Columnar cache for pipeline artifacts.
+
+Artifacts keep their historical CSV paths (data/x.csv) as names. The cache stores a
+typed Parquet copy next to each one (data/x.parquet) and reads that memory-mapped, with
+column projection. A CSV without an up-to-date Parquet copy is migrated on first read.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+def parquet_path(path):
+    return os.path.splitext(path)[0] + ".parquet"
+
+
+def temp_path(path):
+    """A temporary name next to path, unique per process and thread, so concurrent writers never share one."""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+@contextmanager
+def atomic_write(path):
+    """
+    Yields a temporary path to write the new content of `path` to. On success it replaces
+    `path` in one step, so readers never see a partial file; on error it is removed.
+
+        with atomic_write("data/x.json") as tmp_path:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+    """
+    tmp_path = temp_path(path)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def exists(path):
+    """True if the artifact is available as Parquet or as CSV."""
+    return os.path.exists(parquet_path(path)) or os.path.exists(path)
+
+
+def artifact_rows(path, chunksize=100_000):
+    """
+    Row count from the Parquet footer without reading any data. A CSV without an up-to-date
+    Parquet copy is counted by parsing only its first column, in chunks. None if the artifact
+    does not exist or its CSV cannot be parsed.
+    """
+    if not _is_stale(path):
+        return pq.read_metadata(parquet_path(path)).num_rows
+    if not os.path.exists(path):
+        return None
+    try:
+        return sum(len(chunk) for chunk in pd.read_csv(path, usecols=[0], chunksize=chunksize))
+    except ValueError:
+        return None
+
+
+def _is_stale(path):
+    """Parquet copy missing, or older than a CSV that was replaced by hand or appended to."""
+    pq_path = parquet_path(path)
+    if not os.path.exists(pq_path):
+        return True
+    return os.path.exists(path) and os.path.getmtime(path) > os.path.getmtime(pq_path)
+
+
+def _to_arrow_safe(df):
+    """Object columns holding anything but strings (mixed types, lists) are stored as their str()."""
+    df = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        if pd.api.types.infer_dtype(df[col], skipna=True) not in ("string", "empty"):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def _restore_nulls(df):
+    """Parquet hands back missing strings as None; pandas CSV reads give NaN, which the cleaners expect."""
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
+
+
+def write_cache(df, path, csv=False):
+    """Writes df as Parquet (and as CSV too with csv=True, for artifacts that are shipped in data/)."""
+    if csv:
+        df.to_csv(path, index=False)
+    with atomic_write(parquet_path(path)) as tmp_path:
+        _to_arrow_safe(df).to_parquet(tmp_path, index=False)
+
+
+class CacheWriter:
+    """
+    Incremental write_cache: appends DataFrame batches to the artifact as they are produced,
+    so writers that stream their input never hold the full artifact in memory.
+    The Parquet copy is only moved into place by close(); the first batch fixes its schema.
+
+        with CacheWriter("data/x.csv", csv=True) as cache:
+            for df in batches:
+                cache.write(df)
+    """
+
+    def __init__(self, path, csv=False):
+        self.path = path
+        self.csv = csv
+        self.pq_path = parquet_path(path)
+        self.tmp_path = temp_path(self.pq_path)
+        self.writer = None
+        self.rows = 0
+        if csv and os.path.exists(path):
+            os.remove(path)
+
+    def write(self, df):
+        if self.csv:
+            df.to_csv(self.path, index=False, mode="a", header=not os.path.exists(self.path))
+        schema = self.writer.schema if self.writer is not None else None
+        table = pa.Table.from_pandas(_to_arrow_safe(df), schema=schema, preserve_index=False)
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.tmp_path, table.schema)
+        self.writer.write_table(table)
+        self.rows += len(df)
+
+    def close(self):
+        if self.writer is None:
+            return
+        self.writer.close()
+        self.writer = None
+        os.replace(self.tmp_path, self.pq_path)
+
+    def abort(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def read_cache(path, columns=None, **csv_kwargs):
+    """
+    Reads an artifact, projecting to `columns` (missing ones are skipped).
+    csv_kwargs are the read_csv options for the one-time migration from CSV.
+    """
+    if _is_stale(path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Cache file '{path}' does not exist.")
+        df = pd.read_csv(path, **csv_kwargs)
+        write_cache(df, path)
+        print(f"   NOTICE: Migrated {path} to {parquet_path(path)}")
+        if columns is not None:
+            df = df[[c for c in columns if c in df.columns]]
+        return df
+
+    pq_path = parquet_path(path)
+    if columns is not None:
+        available = set(pq.read_schema(pq_path).names)
+        columns = [c for c in columns if c in available]
+    return _restore_nulls(pd.read_parquet(pq_path, columns=columns, memory_map=True))
+
@@ -7,12 +7,16 @@ Basic cleaners that turn raw fetch results into
 
 import ast
 import hashlib
+import numpy as np
 import pandas as pd
 from rapidfuzz import fuzz, process  # Add this import at the top
 import re
 import json
 import os
 from dotenv import load_dotenv
+from src.cache import atomic_write
+from src.instrumentation import instrumented
+from src.startup_schema import apply_startup_dtypes, normalise_names, startup_ids
 
 
 region_map = {
@@ -72,74 +76,83 @@ region_map = {
 
 # ---------- helpers -------------------------------------------------
 
-def _normalise(name: str) -> str:
-    import re
-    if pd.isnull(name):
-        return ""
-    return re.sub(r'[^a-z0-9]', '', name.lower())
+def _paper_ids(arxiv_urls):
+    """E.g http://arxiv.org/abs/2406.04641v1  →  2406.04641v1   (unique + short)"""
+    return arxiv_urls.astype(str).str.rsplit("/", n=1).str[-1]
+
+# JSON column -> paths to the dict holding value_usd/currency, in priority order within the column
+FUNDING_JSON_SOURCES = [
+    ("funds_total", [()]),
+    ("financials_highlights", [(), ("funding_total",)]),
+    ("funding_rounds", [("value",)]),
+    # funds_raised is not used: it includes investments in other companies
+]
+
+
+def _parse_json_column(series):
+    """json.loads every distinct non-empty string of the column once; cells that do not parse become None."""
+    is_text = series.map(lambda value: isinstance(value, str))
+    text = series[is_text & (series != "")]
+    parsed = {}
+    for value in text.unique():
+        try:
+            parsed[value] = json.loads(value)
+        except ValueError:
+            parsed[value] = None
+    return text.map(parsed)
+
+
+def _funding_at(data, path):
+    """(hit, value_usd, currency) for the dict at `path` in data; hit means it has a value_usd key."""
+    for key in path:
+        data = data.get(key) if isinstance(data, dict) else None
+    if isinstance(data, dict) and "value_usd" in data:
+        return True, data["value_usd"], data.get("currency", "USD")
+    return False, None, None
 
-def _paper_id(arxiv_url: str) -> str:
-    """E.g 2406.04641v1  →  2406.04641v1   (unique + short)"""
-    return arxiv_url.rsplit("/", 1)[-1]
 
-def extract_funding_total_and_currency(row):
+def extract_funding_total_and_currency(cb_info_df):
     """
-    Extracts the most accurate funding_total and funding_currency for a Crunchbase company row.
+    Extracts the most accurate funding_total and funding_currency for every Crunchbase company.
     Priority:
-    1. funds_total 
-    2. financials_highlights 
-    3. funding_rounds
-    4. funds_raised 
-    """
-    import json
-    # 1. funds_total
-    if "funds_total" in row and pd.notnull(row["funds_total"]) and row["funds_total"] != "":
-        try:
-            data = json.loads(row["funds_total"])
-            if isinstance(data, dict) and "value_usd" in data:
-                return data["value_usd"], data.get("currency", "USD")
-        except Exception:
-            pass
-    # 2. financials_highlights
-    if "financials_highlights" in row and pd.notnull(row["financials_highlights"]) and row["financials_highlights"] != "":
-        try:
-            data = json.loads(row["financials_highlights"])
-            # If top-level has value_usd
-            if isinstance(data, dict):
-                if "value_usd" in data:
-                    return data["value_usd"], data.get("currency", "USD")
-                # If nested under "funding_total"
-                if "funding_total" in data and isinstance(data["funding_total"], dict):
-                    funding = data["funding_total"]
-                    if "value_usd" in funding:
-                        return funding["value_usd"], funding.get("currency", "USD")
-        except Exception:
-            pass
-    # 3. funding_rounds
-    if "funding_rounds" in row and pd.notnull(row["funding_rounds"]) and row["funding_rounds"] != "":
-        try:
-            data = json.loads(row["funding_rounds"])
-            if isinstance(data, dict) and "value" in data and isinstance(data["value"], dict):
-                value_dict = data["value"]
-                if "value_usd" in value_dict:
-                    return value_dict["value_usd"], value_dict.get("currency", "USD")
-        except Exception:
-            pass
-    # 4. funds_raised - problematic because included investments in other companies
-    # if "funds_raised" in row and pd.notnull(row["funds_raised"]) and row["funds_raised"] != "":
-    #     try:
-    #         data = json.loads(row["funds_raised"])
-    #         # If it's a list of dicts, sum all 'money_raised' values
-    #         if isinstance(data, list):
-    #             total_raised = sum(entry.get("money_raised", 0) for entry in data if isinstance(entry, dict) and "money_raised" in entry)
-    #             if total_raised > 0:
-    #                 return total_raised, "USD"
-    #         # If it's a dict (legacy case)
-    #         elif isinstance(data, dict) and "money_raised" in data:
-    #             return data["money_raised"], data.get("currency", "USD")
-    #     except Exception:
-    #         pass
-    return None, None
+    1. funds_total
+    2. financials_highlights (top level, then nested under "funding_total")
+    3. funding_rounds ("value")
+
+    Each JSON column is parsed once per distinct value. The first source that has a value_usd
+    key wins, even if that value is null, like the original per-row lookup. Rows are handled
+    by position, so any index (including a non-unique one) is carried over unchanged.
+
+    Returns:
+        (pd.Series, pd.Series): funding amount and currency (object dtype, None where not found).
+    """
+    amount = pd.Series([None] * len(cb_info_df), dtype=object)
+    currency = amount.copy()
+    resolved = pd.Series(False, index=amount.index)
+    for column, paths in FUNDING_JSON_SOURCES:
+        if column not in cb_info_df.columns:
+            continue
+        parsed = _parse_json_column(cb_info_df[column].reset_index(drop=True))
+        for path in paths:
+            found = pd.DataFrame(parsed.map(lambda data: _funding_at(data, path)).tolist(),
+                                 index=parsed.index, columns=["hit", "amount", "currency"])
+            take = found.index[found["hit"].astype(bool) & ~resolved[found.index]]
+            amount[take] = found.loc[take, "amount"]
+            currency[take] = found.loc[take, "currency"]
+            resolved[take] = True
+    amount.index = currency.index = cb_info_df.index
+    return amount, currency
+
+
+def _map_unique(series, func):
+    """Applies func once per distinct non-null value; null cells become None. Works by position, so any index is kept."""
+    values = series.to_numpy(dtype=object)
+    present = pd.notna(values)
+    uniques = pd.unique(values[present])
+    lookup = dict(zip(uniques, map(func, uniques)))
+    mapped = np.full(len(values), None, dtype=object)
+    mapped[present] = [lookup[v] for v in values[present]]
+    return pd.Series(mapped, index=series.index, dtype=object)
 
 
 def extract_location_from_json(cell):
@@ -155,42 +168,74 @@ def extract_location_from_json(cell):
         return None
     return None
 
-def extract_country(location):
-    if pd.isna(location):
+
+def extract_country(locations):
+    """Last comma-separated part of every location ("New York, NY, USA" -> "USA"), None where missing."""
+    country = locations.astype(object).str.rsplit(",", n=1).str[-1].str.strip()
+    return country.astype(object).where(country.notna(), None)
+
+
+def map_region(countries):
+    """region_map lookup done once per distinct country (via a categorical); unmapped -> "Unknown"."""
+    regions = countries.astype("category").map(region_map)
+    return regions.astype(object).fillna("Unknown")
+
+
+def _year_to_date(value):
+    # If it's a float year (from YC), convert to YYYY-MM-DD
+    try:
+        year = int(value)
+        return f"{year}-01-01"
+    except (ValueError, TypeError):
         return None
-    parts = [p.strip() for p in location.split(',')]
-    return parts[-1] if parts else None
-
-
-def unify_founding_date(row):
-    # Try all possible columns in order of preference
-    for col in ['founded_at', 'founded_date', 'first_funding_at', 'founded']:
-        val = row.get(col, None)
-        if pd.notnull(val) and str(val).strip() != '':
-            # If it's a float year (from YC), convert to YYYY-MM-DD
-            if col == 'founded':
-                try:
-                    year = int(val)
-                    return f"{year}-01-01"
-                except (ValueError, TypeError):
-                    return None
-            return str(val)
-    return None
 
 
+FOUNDING_DATE_COLUMNS = ['founded_at', 'founded_date', 'first_funding_at', 'founded']
+
+
+def unify_founding_date(startups_df):
+    """
+    Coalesces the founding date columns in order of preference: the first non-empty value
+    of every row wins. YC's 'founded' holds a year and becomes YYYY-01-01.
+    """
+    unified = pd.Series([None] * len(startups_df), index=startups_df.index, dtype=object)
+    resolved = pd.Series(False, index=startups_df.index)
+    for col in FOUNDING_DATE_COLUMNS:
+        if col not in startups_df.columns:
+            continue
+        values = startups_df[col]
+        present = values.notna() & (values.astype(str).str.strip() != '') & ~resolved
+        if col == 'founded':
+            unified[present] = _map_unique(values[present], _year_to_date).to_numpy()
+        else:
+            unified[present] = values[present].astype(str).to_numpy()
+        resolved |= present
+    return unified
+
+
+def parse_dates(dates):
+    """to_datetime with a YYYY-MM-DD fast path; other formats are parsed individually, unparsable -> NaT."""
+    parsed = pd.to_datetime(dates, format="%Y-%m-%d", errors="coerce")
+    rest = dates.notna() & parsed.isna()
+    if rest.any():
+        parsed[rest] = pd.to_datetime(dates[rest], format="mixed", errors="coerce", utc=True).dt.tz_localize(None)
+    return parsed
 
+
+@instrumented
 def startup_name_normalization(startups_yc, startups_crunchbase, cb_info_df):
     startups_yc['original_name_yc'] = startups_yc['name']
     startups_crunchbase['original_name_crunchbase'] = startups_crunchbase['name']
     cb_info_df['original_name_cb_info'] = cb_info_df['name']
 
-    # Add normalized name columns
-    startups_yc["name"] = startups_yc["name"].apply(_normalise)
-    startups_crunchbase["name"] = startups_crunchbase["name"].apply(_normalise)
-    cb_info_df["name"] = cb_info_df["name"].apply(_normalise)
+    # Add normalized name columns and the integer id the merges join on
+    for df in (startups_yc, startups_crunchbase, cb_info_df):
+        df["name"] = normalise_names(df["name"])
+        df["startup_id"] = startup_ids(df["name"])
 
     return startups_yc, startups_crunchbase, cb_info_df
 
+@instrumented
 def clean_merge_startups(startups_yc, startups_crunchbase, cb_info_df):
     """
     """
@@ -207,10 +252,10 @@ def clean_merge_startups(startups_yc, startups_crunchbase, cb_info_df):
     # non_null_dates = startups_crunchbase[date_cols].notnull().any(axis=1)
     # print(f"DATE EXTRACTION: Number of startups_crunchbase startups with non-null values in at least one date column: {non_null_dates.sum()}")
 
-    # Merge YC-labeled startups with Crunchbase data by normalized name
+    # Merge YC-labeled startups with Crunchbase data by normalized name (via its id)
     startups_enriched = startups_yc.merge(
-        startups_crunchbase,
-        on="name", how="left", suffixes=('', '_crunchbase')
+        startups_crunchbase.drop(columns="name"),
+        on="startup_id", how="left", suffixes=('', '_crunchbase')
     )
 
     #print("FUNDING EXTRACTION: Number of startups with non-null fundings in startups_enriched:", startups_enriched['funding_total_usd'].notnull().sum())
@@ -218,14 +263,13 @@ def clean_merge_startups(startups_yc, startups_crunchbase, cb_info_df):
 
 
     # Add YC+Crunchbase merged startups only if not already present in cb_info_df
-    existing_names = set(cb_info_df["name"])
-    startups_df_filtered = startups_enriched[~startups_enriched["name"].isin(existing_names)]
+    startups_df_filtered = startups_enriched[~startups_enriched["startup_id"].isin(cb_info_df["startup_id"])].copy()
 
     # Location cleanup
-    # Use .loc to avoid SettingWithCopyWarning
-    startups_df_filtered.loc[:, 'country'] = startups_df_filtered['location'].apply(extract_country)
-    startups_df_filtered.loc[:, 'region'] = startups_df_filtered['country'].map(region_map).fillna("Unknown")
-    cb_info_df["location_extracted"] = cb_info_df["location"].apply(extract_location_from_json)
+    # Whole-column assignment: region may arrive as a categorical of the YC labels
+    startups_df_filtered['country'] = extract_country(startups_df_filtered['location'])
+    startups_df_filtered['region'] = map_region(startups_df_filtered['country'])
+    cb_info_df["location_extracted"] = _map_unique(cb_info_df["location"], extract_location_from_json)
 
     # Funding cleanup
     startups_df_filtered, cb_info_df = extract_funding(startups_df_filtered, cb_info_df)
@@ -239,15 +283,16 @@ def clean_merge_startups(startups_yc, startups_crunchbase, cb_info_df):
     # print(f"Before merging, number of shared names between cb_info_df and startups_df_filtered: {len(shared_names)}")
 
     all_startups_df = pd.concat([cb_info_df, startups_df_filtered], ignore_index=True)
-    all_startups_df = all_startups_df.drop_duplicates(subset=["name"], keep="first")
+    all_startups_df = all_startups_df.drop_duplicates(subset=["startup_id"], keep="first")
     
     # Founding date cleanup
     date_cols = ['founded_at', 'founded_date', 'first_funding_at', 'founded']
     non_null_dates = all_startups_df[date_cols].notnull().any(axis=1)
     #print(f"DATE EXTRACTION: Number of all_startups_df startups with non-null values in at least one date column: {non_null_dates.sum()}")
 
-    all_startups_df['founding_date_final'] = all_startups_df.apply(unify_founding_date, axis=1)
-    all_startups_df['founded_date_parsed'] = pd.to_datetime(all_startups_df['founding_date_final'], errors='coerce')
+    all_startups_df['founding_date_final'] = unify_founding_date(all_startups_df)
+    all_startups_df['founded_date_parsed'] = parse_dates(all_startups_df['founding_date_final'])
+    apply_startup_dtypes(all_startups_df)
 
     return all_startups_df
 
@@ -287,15 +332,10 @@ def extract_funding(startups_df, cb_info_df):
    
     # Always attempt to extract funding from JSON fields for Crunchbase/Brightdata
     #print("\n--- clean_startups: cb_info_df - Extracting funding from JSON fields (funds_raised, financials_highlights, funding_total, featured_list) ---")
-    funding_extracted_series = cb_info_df.apply(
-        lambda row: extract_funding_total_and_currency(row),
-        axis=1
-    )
-
-    temp_funding_df = pd.DataFrame(funding_extracted_series.tolist(), index=cb_info_df.index, columns=['funding_amount_from_json', 'funding_currency_from_json'])
-    cb_info_df['funding_total_usd_json'] = pd.to_numeric(temp_funding_df['funding_amount_from_json'], errors='coerce')
+    funding_amount, funding_currency = extract_funding_total_and_currency(cb_info_df)
+    cb_info_df['funding_total_usd_json'] = pd.to_numeric(funding_amount, errors='coerce')
     # Add 'funding_currency_from_json' if it's not already there
-    cb_info_df['funding_currency_from_json'] = temp_funding_df['funding_currency_from_json']
+    cb_info_df['funding_currency_from_json'] = funding_currency
     if 'funding_total_usd_json' not in cb_info_df.columns:
         cb_info_df['funding_total_usd_json'] = pd.NA
     cb_info_df['funding_total_usd'] = cb_info_df['funding_total_usd_json']
@@ -318,17 +358,59 @@ def extract_funding(startups_df, cb_info_df):
     return startups_df, cb_info_df
 
 
+# Columns of the fetched arXiv entries used downstream; authors stay unparsed strings until iter_paper_authors
+PAPER_COLUMNS = ["id", "technology", "published", "title", "summary", "authors"]
+
+
+@instrumented
+def ingest_papers(papers_raw):
+    """
+    Parses the fetched arXiv entries once for both match_papers_to_tech and clean_arxiv:
+    one row per (paper, technology) with paper_id and a parsed published timestamp.
+    """
+    papers = papers_raw[[c for c in PAPER_COLUMNS if c in papers_raw.columns]].copy()
+    papers["paper_id"] = _paper_ids(papers["id"])
+    papers["published"] = pd.to_datetime(papers["published"])
+    return papers
 
-def clean_arxiv(raw_list: list[dict]) -> tuple[pd.DataFrame, pd.DataFrame]:
-    csv_rows = pd.read_csv("data/arxiv_papers_res.csv")
-    csv_rows["paper_id"] = csv_rows["id"].map(_paper_id)
-    csv_rows["published"] = pd.to_datetime(csv_rows["published"])
-    csv_rows["authors"] = csv_rows["authors"].apply(
-        lambda s: ast.literal_eval(s) if isinstance(s, str) else s
-    )
 
+def _ingested(papers):
+    return papers if "paper_id" in papers.columns else ingest_papers(papers)
+
+
+def author_ids(names):
+    """Stable int64 id per author, keyed on the lowercased name with whitespace collapsed."""
+    key = names.astype(str).str.lower().str.split().str.join(" ")
+    return pd.Series(pd.util.hash_array(key.to_numpy(dtype=object)).view(np.int64), index=names.index)
+
+
+def iter_paper_authors(papers, chunk_size=10_000):
+    """
+    Yields DataFrames of (paper_id, author_id, author) pairs, parsing the authors lists of
+    chunk_size papers at a time, so the pairs are never all exploded in memory at once.
+    A paper listed under several technologies contributes its authors once.
+    """
+    papers = _ingested(papers).drop_duplicates("paper_id")
+    # At least one (possibly empty) chunk, so writers always produce their artifact
+    for start in range(0, max(len(papers), 1), chunk_size):
+        chunk = papers.iloc[start:start + chunk_size]
+        # Same stringified-list format as the Kaggle skills
+        pairs = pd.DataFrame(
+            [(paper_id, name.strip())
+             for paper_id, authors in zip(chunk["paper_id"], chunk["authors"])
+             for name in parse_skills_list(authors) if name.strip()],
+            columns=["paper_id", "author"],
+        )
+        pairs["author_id"] = author_ids(pairs["author"])
+        yield pairs.drop_duplicates(["paper_id", "author_id"])[["paper_id", "author_id", "author"]]
+
+
+@instrumented
+def clean_arxiv(papers: pd.DataFrame) -> pd.DataFrame:
+    """Paper nodes: one row per paper_id from the (ingested or raw) arXiv entries."""
+    papers = _ingested(papers)
     papers_df = (
-        csv_rows[["paper_id", "id", "title", "summary", "published"]]
+        papers[["paper_id", "id", "title", "summary", "published"]]
         .drop_duplicates("paper_id")
     )
 
@@ -339,6 +421,12 @@ load_dotenv()
 
 # Load canonical techs and synonyms from JSON
 EMERGING_TECHS_JSON = os.getenv("EMERGING_TECHS", "data/emerging_techs.json")
+# Persistent startup-to-tech match caches, see _cached_synonym_matches. One per startup source:
+# the match stages run concurrently and must not write the same file.
+MATCH_CACHE_YC_FILE = os.getenv("MATCH_CACHE_YC", "data/.match_cache_yc.pkl")
+MATCH_CACHE_CB_INFO_FILE = os.getenv("MATCH_CACHE_CB_INFO", "data/.match_cache_cb_info.pkl")
+# Persistent LinkedIn role -> Kaggle title matches, see match_roles_to_titles
+ROLE_MATCH_CACHE_FILE = os.getenv("ROLE_MATCH_CACHE", "data/.role_title_matches.json")
 TECH_SYNONYMS = {}
 try:
     with open(EMERGING_TECHS_JSON, encoding='utf-8') as f:
@@ -346,89 +434,370 @@ try:
 except Exception:
     TECH_SYNONYMS = {}
 
-def match_startups_to_techs(startups_df, techs_df, text_columns=None, threshold=85):
+def _synonym_table(techs_df, threshold):
     """
-    Fuzzy matches startups to technologies using rapidfuzz.
-    Returns a DataFrame with columns: startup_name, technology, qid, score.
-    text_columns: list of columns to use for text matching (default: long_description, industry, short_description, tags, name)
+    One entry per synonym, in matching order: (synonym, canonical tech, qid, threshold).
+    Synonyms are lowercased, so a synonym listed under several techs maps to the last one.
     """
-    matches = []
-    # Build a mapping from synonym to canonical tech name and QID
     synonym_to_canonical_qid = {}
-    for _, tech in techs_df.iterrows():
-        tech_name = tech['name']
-        qid = tech.get('qid', None)
+    qids = techs_df['qid'] if 'qid' in techs_df.columns else [None] * len(techs_df)
+    for tech_name, qid in zip(techs_df['name'], qids):
         for synonym in TECH_SYNONYMS.get(tech_name, [tech_name]):
             synonym_to_canonical_qid[synonym.lower()] = (tech_name, qid)
 
+    table = []
+    for synonym, (canonical, qid) in synonym_to_canonical_qid.items():
+        clean_synonym = synonym.strip()
+        # Dynamic threshold: 95 if any word in the synonym is <4 chars, else normal
+        dynamic_threshold = 95 if any(len(w) <= 4 for w in clean_synonym.split()) else threshold
+        table.append((clean_synonym, canonical, qid, dynamic_threshold))
+    return table
+
+
+def _startup_texts(startups_df, text_columns):
+    """Space-joined text columns per startup, as str() would render each cell."""
+    parts = [
+        startups_df[col].astype(str) if col in startups_df.columns else pd.Series('', index=startups_df.index)
+        for col in text_columns
+    ]
+    if not parts:
+        return pd.Series('', index=startups_df.index)
+    return parts[0].str.cat(parts[1:], sep=" ")
+
+
+def _short_synonym_hits(texts, short_synonyms):
+    """
+    Boolean (texts x short_synonyms) matrix of whole-word, case-insensitive hits.
+    A single alternation finds every position where some synonym starts (zero-width, so
+    overlapping hits like ".ai" and "ai" are all seen); only those positions are then
+    checked against the individual synonyms.
+    """
+    hits = np.zeros((len(texts), len(short_synonyms)), dtype=bool)
+    if not short_synonyms:
+        return hits
+    escaped = [re.escape(s) for s in short_synonyms]
+    any_synonym = re.compile(rf"(?=\b(?:{'|'.join(escaped)})\b)", re.IGNORECASE)
+    patterns = [re.compile(rf"\b{e}\b", re.IGNORECASE) for e in escaped]
+    for i, text in enumerate(texts):
+        for hit in any_synonym.finditer(text):
+            pos = hit.start()
+            for j, pattern in enumerate(patterns):
+                if not hits[i, j] and pattern.match(text, pos):
+                    hits[i, j] = True
+    return hits
+
+
+def _token_frame(texts):
+    """Inverted-index rows: one (doc, token) pair per distinct whitespace token of each text."""
+    tokens = pd.Series(list(texts), dtype=object).str.split().explode().dropna()
+    return pd.DataFrame({"doc": tokens.index.to_numpy(), "token": tokens.to_numpy()}).drop_duplicates()
+
+
+def _token_set_lengths(token_frame, n_docs):
+    """Length of " ".join(sorted(set(tokens))) per doc, the string token_set_ratio compares."""
+    docs = token_frame["doc"].to_numpy()
+    chars = np.bincount(docs, weights=token_frame["token"].str.len().to_numpy(), minlength=n_docs)
+    counts = np.bincount(docs, minlength=n_docs)
+    return np.where(counts > 0, chars + counts - 1, 0)
+
+
+def _fuzzy_candidates(texts_lower, synonyms_lower, thresholds):
+    """
+    (text, synonym) index pairs that can reach their threshold under token_set_ratio.
+
+    A pair is a candidate if the synonym shares a token with the text, found through an
+    inverted token index restricted to the synonym vocabulary. Without a shared token
+    token_set_ratio is the indel ratio of the two token strings, which is at most
+    200 * min(a, b) / (a + b) for lengths a and b, so disjoint pairs are only kept when that
+    length bound reaches the threshold (in practice: very short texts).
+    """
+    doc_tokens = _token_frame(texts_lower)
+    syn_tokens = _token_frame(synonyms_lower)
+
+    index = doc_tokens[doc_tokens["token"].isin(syn_tokens["token"])]
+    shared = syn_tokens.merge(index, on="token", suffixes=("_syn", ""))
+    pairs = [shared[["doc", "doc_syn"]].to_numpy()]
+
+    doc_lengths = _token_set_lengths(doc_tokens, len(texts_lower))
+    syn_lengths = _token_set_lengths(syn_tokens, len(synonyms_lower))
+    order = np.argsort(doc_lengths, kind="stable")
+    sorted_lengths = doc_lengths[order]
+    for j, (length, threshold) in enumerate(zip(syn_lengths, thresholds)):
+        if length <= 0 or threshold <= 0 or threshold > 100:
+            continue
+        lo = np.searchsorted(sorted_lengths, length * threshold / (200 - threshold) - 1e-9, side="left")
+        hi = np.searchsorted(sorted_lengths, length * (200 - threshold) / threshold + 1e-9, side="right")
+        docs = order[lo:hi]
+        docs = docs[sorted_lengths[lo:hi] > 0]
+        pairs.append(np.column_stack([docs, np.full(len(docs), j)]))
+
+    pairs = np.unique(np.concatenate(pairs).astype(np.int64).reshape(-1, 2), axis=0)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def _synonym_matches(texts, synonyms, thresholds, workers=-1):
+    """
+    (text index, synonym index, score) of every pair scoring at least its threshold, with the
+    same rules as the original per-pair loop: synonyms of <= 3 chars score 100 on a whole-word
+    regex hit, longer ones get fuzz.token_set_ratio against the lowercased text.
+    Fuzzy scoring only runs on the candidate pairs from _fuzzy_candidates, one multi-threaded
+    rapidfuzz cdist call per synonym, so cost follows the number of real candidates.
+    Pairs come back in (text, synonym) order.
+    """
+    texts = list(texts)
+    texts_lower = [t.lower() for t in texts]
+    short_idx = np.array([j for j, s in enumerate(synonyms) if len(s) <= 3], dtype=np.int64)
+    fuzzy_idx = np.array([j for j, s in enumerate(synonyms) if len(s) > 3], dtype=np.int64)
+
+    hits = _short_synonym_hits(texts, [synonyms[j] for j in short_idx])
+    hit_rows, hit_cols = np.nonzero(hits)
+    rows, cols, scores = [hit_rows], [short_idx[hit_cols]], [np.full(len(hit_rows), 100.0)]
+
+    if len(fuzzy_idx):
+        fuzzy_synonyms = [synonyms[j].lower() for j in fuzzy_idx]
+        fuzzy_thresholds = [thresholds[j] for j in fuzzy_idx]
+        cand_docs, cand_syns = _fuzzy_candidates(texts_lower, fuzzy_synonyms, fuzzy_thresholds)
+        for k in np.unique(cand_syns):
+            docs = cand_docs[cand_syns == k]
+            syn_scores = process.cdist(
+                [texts_lower[d] for d in docs], [fuzzy_synonyms[k]], scorer=fuzz.token_set_ratio,
+                dtype=np.float64, score_cutoff=fuzzy_thresholds[k], workers=workers,
+            )[:, 0]
+            keep = syn_scores >= fuzzy_thresholds[k]
+            rows.append(docs[keep])
+            cols.append(np.full(keep.sum(), fuzzy_idx[k]))
+            scores.append(syn_scores[keep])
+
+    rows, cols, scores = np.concatenate(rows), np.concatenate(cols), np.concatenate(scores)
+    order = np.lexsort((cols, rows))
+    return rows[order], cols[order], scores[order]
+
+
+def _tech_hashes(table, threshold):
+    """Hash of each technology's (synonym, threshold) list; any edit to a tech's synonyms changes it."""
+    per_tech = {}
+    for synonym, canonical, _, dynamic_threshold in table:
+        per_tech.setdefault(canonical, []).append((synonym, dynamic_threshold))
+    return {
+        canonical: hashlib.sha1(json.dumps([threshold, entries]).encode()).hexdigest()
+        for canonical, entries in per_tech.items()
+    }
+
+
+def _empty_match_cache():
+    return {
+        "techs": {},      # canonical -> tech hash the entries below were scored with
+        "scored": {},     # canonical -> uint64 text hashes already scored against that tech
+        "matches": pd.DataFrame({
+            "text_hash": pd.Series(dtype=np.uint64),
+            "synonym": pd.Series(dtype=object),
+            "technology": pd.Series(dtype=object),
+            "score": pd.Series(dtype=np.float64),
+        }),
+    }
+
+
+def _load_match_cache(path):
+    if not os.path.exists(path):
+        return _empty_match_cache()
+    try:
+        return pd.read_pickle(path)
+    except Exception as e:
+        print(f"   NOTICE: Ignoring unreadable match cache {path}: {e}")
+        return _empty_match_cache()
+
+
+def _save_match_cache(cache, path):
+    with atomic_write(path) as tmp_path:
+        pd.to_pickle(cache, tmp_path)
+
+
+def _cached_synonym_matches(texts, table, threshold, workers, cache_path):
+    """
+    _synonym_matches backed by a persistent cache keyed by text hash and tech hash.
+
+    Only (text, tech) combinations the cache has not seen are scored: new or edited
+    startup texts against every tech, and every text against techs whose synonym list
+    changed. Everything else is reused, and the result is identical to a full rescore.
+    """
+    synonyms = [t[0] for t in table]
+    canonicals = [t[1] for t in table]
+    thresholds = [t[3] for t in table]
+    texts = list(texts)
+    text_hashes = pd.util.hash_array(np.asarray(texts, dtype=object))
+    unique_hashes, first_pos = np.unique(text_hashes, return_index=True)
+
+    cache = _load_match_cache(cache_path)
+    matches = cache["matches"]
+    tech_hashes = _tech_hashes(table, threshold)
+    changed = [c for c, h in tech_hashes.items() if cache["techs"].get(c) != h]
+    if changed:
+        matches = matches[~matches["technology"].isin(changed)]
+        for canonical in changed:
+            cache["techs"][canonical] = tech_hashes[canonical]
+            cache["scored"][canonical] = np.array([], dtype=np.uint64)
+
+    # Group techs by the set of texts they still need, so each group is one scoring call
+    pending = {}
+    for canonical in tech_hashes:
+        need = ~np.isin(unique_hashes, cache["scored"][canonical])
+        if need.any():
+            pending.setdefault(need.tobytes(), (need, []))[1].append(canonical)
+
+    new_matches = [matches]
+    for need, techs in pending.values():
+        syn_idx = [j for j, c in enumerate(canonicals) if c in techs]
+        rows, cols, scores = _synonym_matches(
+            [texts[p] for p in first_pos[need]], [synonyms[j] for j in syn_idx],
+            [thresholds[j] for j in syn_idx], workers,
+        )
+        new_matches.append(pd.DataFrame({
+            "text_hash": unique_hashes[need][rows],
+            "synonym": [synonyms[syn_idx[c]] for c in cols],
+            "technology": [canonicals[syn_idx[c]] for c in cols],
+            "score": scores,
+        }))
+        for canonical in techs:
+            cache["scored"][canonical] = np.union1d(cache["scored"][canonical], unique_hashes[need])
+    if pending:
+        print(f"   Match cache: rescored {len(pending)} group(s), {len(changed)} changed tech(s)")
+    cache["matches"] = pd.concat(new_matches, ignore_index=True)
+    _save_match_cache(cache, cache_path)
+
+    # Expand cached matches back onto the input rows, in (text, synonym) order
+    syn_pos = pd.DataFrame({"synonym": synonyms, "technology": canonicals, "col": range(len(synonyms))})
+    found = (
+        pd.DataFrame({"text_hash": text_hashes, "row": range(len(texts))})
+        .merge(cache["matches"], on="text_hash")
+        .merge(syn_pos, on=["synonym", "technology"])
+    )
+    rows, cols, scores = found["row"].to_numpy(), found["col"].to_numpy(), found["score"].to_numpy()
+    order = np.lexsort((cols, rows))
+    return rows[order], cols[order], scores[order]
+
+
+@instrumented
+def match_startups_to_techs(startups_df, techs_df, text_columns=None, threshold=85, workers=-1, cache_path=None):
+    """
+    Fuzzy matches startups to technologies using rapidfuzz.
+    Returns a DataFrame with columns: startup_name, technology, qid, score.
+    text_columns: list of columns to use for text matching (default: long_description, industry, short_description, tags, name)
+    workers: threads used for fuzzy scoring (-1 = all cores)
+    cache_path: optional match cache file (e.g. MATCH_CACHE_YC_FILE), one per startup source; only new texts and edited techs are rescored
+    """
     # Default columns if not provided
     if text_columns is None:
         text_columns = ['long_description', 'industry', 'short_description', 'tags', 'name']
 
-    for idx, row in startups_df.iterrows():
-        # Lowercase for fuzzy matching, but keep original for short synonym regex
-        text = " ".join([
-            str(row.get(col, '')) for col in text_columns
-        ])
-        text_lower = text.lower()
-        for synonym, (canonical, qid) in synonym_to_canonical_qid.items():
-            clean_synonym = synonym.strip()
-            # Dynamic threshold: 95 if any word in the synonym is <4 chars, else normal
-            words = clean_synonym.split()
-            dynamic_threshold = 95 if any(len(w) <= 4 for w in words) else threshold
-
-            if len(clean_synonym) <= 3:
-                # Only match as a whole word, case-insensitive, in the original text
-                if re.search(rf"\b{re.escape(clean_synonym)}\b", text, re.IGNORECASE):
-                    score = 100
-                else:
-                    score = 0
-            else:
-                score = fuzz.token_set_ratio(clean_synonym.lower(), text_lower)
-            if score >= dynamic_threshold and qid is not None:
-                matches.append({
-                    "startup_name": row.get("name"),
-                    "technology": canonical,
-                    "qid": qid,
-                    "score": score
-                })
-    matches_df = pd.DataFrame(matches)
+    table = _synonym_table(techs_df, threshold)
+    synonyms = [t[0] for t in table]
+    canonicals = np.array([t[1] for t in table], dtype=object)
+    qids = np.array([t[2] for t in table], dtype=object)
+    thresholds = np.array([t[3] for t in table], dtype=np.float64)
+    has_qid = np.array([q is not None for q in qids], dtype=bool)
+
+    texts = _startup_texts(startups_df, text_columns)
+    if cache_path:
+        rows, cols, scores = _cached_synonym_matches(texts, table, threshold, workers, cache_path)
+    else:
+        rows, cols, scores = _synonym_matches(texts, synonyms, thresholds, workers)
+
+    # Matches are in (startup, synonym) order, the same order the per-row loop produced them in
+    keep = has_qid[cols]
+    rows, cols, scores = rows[keep], cols[keep], scores[keep]
+    names = startups_df["name"].to_numpy(dtype=object) if "name" in startups_df.columns else np.full(len(startups_df), None)
+    matches_df = pd.DataFrame({
+        "startup_name": names[rows],
+        "technology": canonicals[cols],
+        "qid": qids[cols],
+        "score": scores,
+    })
     # Keep only the row with the highest score for each (startup_name, technology) pair
     matches_df = matches_df.sort_values("score", ascending=False).drop_duplicates(subset=["startup_name", "technology"], keep="first")
     
     return matches_df
 
+@instrumented
 def match_papers_to_tech(papers_raw, techs_df):
     """
     Maps each paper to the QID of its technology (using the technology column in papers_raw and the name/qid in techs_df).
     Saves a CSV with columns: id, qid.
     """
     tech_name_to_qid = dict(zip(techs_df['name'], techs_df['qid']))
-    papers_raw["paper_id"] = papers_raw["id"].map(_paper_id)
-
-    mapped = []
-    for _, row in papers_raw.iterrows():
-        tech_name = row.get('technology')
-        qid = tech_name_to_qid.get(tech_name)
-        if qid:
-            mapped.append({
-                'paper_id': row.get('paper_id'),
-                'qid': qid
-            })
-    mapped_df = pd.DataFrame(mapped)        
+    papers_raw = _ingested(papers_raw)
+
+    qid = papers_raw['technology'].map(tech_name_to_qid)
+    known = papers_raw['technology'].isin(list(tech_name_to_qid)) & qid.map(bool)
+    mapped_df = pd.DataFrame({
+        'paper_id': papers_raw.loc[known, 'paper_id'],
+        'qid': qid[known],
+    }).reset_index(drop=True)
     return mapped_df
 
 
 # Create a mapping from job title to skills for quick lookup.
-# This now correctly handles the 'job_skills' column which contains a list of skills.
+# Handles both comma-separated skills and stringified lists, without ast.literal_eval.
+_QUOTED_ITEM = re.compile(r"'((?:[^'\\]|\\.)*)'|\"((?:[^\"\\]|\\.)*)\"")
+
 def parse_skills_list(skills_str):
-    if not isinstance(skills_str, str) or not skills_str.startswith('['):
-        return []
-    try:
-        return ast.literal_eval(skills_str)
-    except (ValueError, SyntaxError):
+    if not isinstance(skills_str, str):
         return []
+    skills_str = skills_str.strip()
+    if skills_str.startswith('['):
+        return [a or b for a, b in _QUOTED_ITEM.findall(skills_str)]
+    return [s.strip() for s in skills_str.split(',') if s.strip()]
+
+def _normalise_title(titles):
+    """Lowercase and collapse whitespace, so trivially different titles dedupe to one."""
+    return titles.astype(str).str.lower().str.replace(r'\s+', ' ', regex=True).str.strip()
 
+
+def match_roles_to_titles(roles, titles, score_cutoff=85, workers=-1, max_block_bytes=256 * 2**20, cache_path=None):
+    """
+    Best WRatio match (>= score_cutoff) in titles for every role, as {role: title or None}.
+
+    Roles are scored against all titles with multi-threaded rapidfuzz cdist, in blocks of
+    roles sized so a block's score matrix stays under max_block_bytes. Ties go to the first
+    title, like process.extractOne. With cache_path, results are persisted per role and
+    reused while the title set is unchanged, so repeat runs only score new roles.
+    """
+    roles = list(dict.fromkeys(roles))
+    titles = list(titles)
+    titles_hash = hashlib.sha1("\n".join(sorted(titles)).encode()).hexdigest()
+
+    role_to_title = {}
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+        except ValueError as e:
+            print(f"   NOTICE: Ignoring unreadable role match cache {cache_path}: {e}")
+            cached = {}
+        if cached.get("titles_hash") == titles_hash and cached.get("score_cutoff") == score_cutoff:
+            role_to_title = cached["matches"]
+
+    pending = [r for r in roles if r not in role_to_title]
+    if pending and titles:
+        block_rows = max(1, max_block_bytes // (4 * len(titles)))
+        for start in range(0, len(pending), block_rows):
+            block = pending[start:start + block_rows]
+            scores = process.cdist(block, titles, scorer=fuzz.WRatio, score_cutoff=score_cutoff,
+                                   dtype=np.float32, workers=workers)
+            best = scores.argmax(axis=1)
+            best_scores = scores[np.arange(len(block)), best]
+            for role, idx, score in zip(block, best, best_scores):
+                role_to_title[role] = titles[idx] if score >= score_cutoff else None
+    elif pending:
+        role_to_title.update(dict.fromkeys(pending))
+
+    if cache_path and pending:
+        with atomic_write(cache_path) as tmp_path:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"titles_hash": titles_hash, "score_cutoff": score_cutoff, "matches": role_to_title}, f)
+    return {role: role_to_title[role] for role in roles}
+
+
+@instrumented
 def extract_skills_from_roles(linkedin_staff_df, kaggle_jobs_df):
     """
     Matches LinkedIn roles to Kaggle job titles to infer skills for each startup.
@@ -475,38 +844,28 @@ def extract_skills_from_roles(linkedin_staff_df, kaggle_jobs_df):
             skills_df.drop_duplicates(inplace=True)
             return skills_df
 
-    # Create a unique list of job titles from Kaggle for the fuzzy matching choices
-    unique_kaggle_titles = kaggle_jobs_df['job_title'].dropna().unique()
-
-
     kaggle_jobs_df = kaggle_jobs_df.dropna(subset=['job_title', 'job_skills']).copy()
+    kaggle_jobs_df['title_norm'] = _normalise_title(kaggle_jobs_df['job_title'])
     kaggle_jobs_df['parsed_skills'] = kaggle_jobs_df['job_skills'].apply(parse_skills_list)
 
-    # Group by job title and aggregate the lists of skills into a single list of unique skills
-    title_to_skills_map = kaggle_jobs_df.groupby('job_title')['parsed_skills'].agg(
+    # Group by normalized job title and aggregate the lists of skills into a single list of unique skills
+    title_to_skills_map = kaggle_jobs_df.groupby('title_norm')['parsed_skills'].agg(
         lambda lists: sorted(list(set(skill for sublist in lists for skill in sublist)))
     ).to_dict()
 
-    # Get unique roles from LinkedIn staff to avoid re-matching the same role
-    unique_linkedin_roles = linkedin_staff_df['current_position'].dropna().unique()
-
-    # Create a mapping from linkedin role to the best matching kaggle title
-    role_to_kaggle_map = {}
-    for role in unique_linkedin_roles:
-        # Using process.extractOne to find the best match above a certain threshold
-        match = process.extractOne(role, unique_kaggle_titles, scorer=fuzz.WRatio, score_cutoff=85)
-        if match:
-            # match is a tuple: (matched_title, score, index)
-            role_to_kaggle_map[role] = match[0]
+    # Match each distinct normalized LinkedIn role once against the distinct normalized Kaggle titles
+    staff = linkedin_staff_df.dropna(subset=['current_position'])[['start_up', 'current_position']].copy()
+    staff['role_norm'] = _normalise_title(staff['current_position'])
+    role_to_kaggle_map = match_roles_to_titles(
+        staff['role_norm'].unique(), title_to_skills_map.keys(), cache_path=ROLE_MATCH_CACHE_FILE
+    )
 
     # Use the mapping to get skills for each startup employee
-    for _, row in linkedin_staff_df.iterrows():
-        if pd.notna(row['current_position']):
-            matched_title = role_to_kaggle_map.get(row['current_position'])
-            if matched_title:
-                inferred_skills = title_to_skills_map.get(matched_title, [])
-                for skill in inferred_skills:
-                    all_skills.append({'start_up': row['start_up'], 'skill': skill})
+    staff['skill'] = staff['role_norm'].map(
+        lambda role: title_to_skills_map.get(role_to_kaggle_map.get(role), [])
+    )
+    inferred = staff[['start_up', 'skill']].explode('skill').dropna(subset=['skill'])
+    all_skills.extend(inferred.to_dict('records'))
 
     if not all_skills:
         return pd.DataFrame(columns=['start_up', 'skill'])
@@ -518,6 +877,7 @@ def extract_skills_from_roles(linkedin_staff_df, kaggle_jobs_df):
     
     return skills_df
 
+@instrumented
 def clean_skills(skills_df):
     """
     Normalizes all skill names (lowercase, strip, remove extra spaces).
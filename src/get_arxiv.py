@@ -1,61 +1,195 @@
-import urllib, urllib.request
-import os
+import urllib, urllib.request, urllib.error
+import asyncio
+import io
+import re
+import time
 import xml.etree.ElementTree as ET
 import pandas as pd
 
+from src.instrumentation import measure
+
+
+ARXIV_API_URL = "http://export.arxiv.org/api/query"
+# arXiv API terms of use: no more than one request every three seconds
+ARXIV_REQUESTS_PER_SECOND = 1 / 3
+
+_ATOM = '{http://www.w3.org/2005/Atom}'
+_ENTRY = _ATOM + 'entry'
+ENTRY_COLUMNS = ['id', 'technology', 'published', 'updated', 'title', 'summary', 'authors']
+
+_TOTAL_RESULTS = re.compile(rb"<opensearch:totalResults[^>]*>\s*(\d+)\s*<")
+
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second on average, bursts of at most `capacity`."""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
 
 
 # this function converts search query into arxivAPI url
-def fetch_arxiv(queries, max_results=100):
-    all_results = []
+def _query_url(base_url, query, start, max_results):
+    # Build search query: "quantum computing" → "all:quantum+computing"
+    words = query.strip().split()
+    formatted_query = "all:" + "+".join(words)
+    return f"{base_url}?search_query={formatted_query}&start={start}&max_results={max_results}"
+
 
-    for query in queries:
-        # Build search query: "quantum computing" → "all:quantum+computing"
-        words = query.strip().split()
-        formatted_query = "all:" + "+".join(words)
+def _http_get(url, timeout):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return response.read()
 
-        # Construct the full API URL
-        url = f"http://export.arxiv.org/api/query?search_query={formatted_query}&start=0&max_results={max_results}"
 
-        # Fetch the data
+async def _fetch_page(url, bucket, timeout, retries, backoff):
+    """GET one result page under the rate limit, retrying with exponential backoff."""
+    for attempt in range(retries + 1):
+        await bucket.acquire()
         try:
-            data = urllib.request.urlopen(url).read().decode('utf-8')
-            all_results.append({
-                "query": query,
-                "response": data
-            })
-        except Exception as e:
-            print(f"Error fetching for '{query}': {e}")
-            all_results.append({
-                "query": query,
-                "response": None,
-                "error": str(e)
-            })
+            return await asyncio.to_thread(_http_get, url, timeout)
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt
+            print(f"   ... retrying {url} in {delay:.0f}s ({e})")
+            await asyncio.sleep(delay)
+
+
+async def _fetch_query(query, on_page, bucket, semaphore, base_url, max_results, page_size, timeout, retries, backoff):
+    """Pages through `start` offsets until max_results or the reported total is reached."""
+    async with semaphore:
+        start, total = 0, None
+        while start < max_results and (total is None or start < total):
+            size = min(page_size, max_results - start)
+            url = _query_url(base_url, query, start, size)
+            try:
+                data = await _fetch_page(url, bucket, timeout, retries, backoff)
+            except Exception as e:
+                print(f"Error fetching for '{query}': {e}")
+                on_page(query, None, str(e))
+                return
+            match = _TOTAL_RESULTS.search(data)
+            total = int(match.group(1)) if match else 0
+            on_page(query, data.decode('utf-8'), None)
+            start += size
+
+
+async def fetch_arxiv_async(queries, on_page, max_results=100, page_size=100, base_url=ARXIV_API_URL,
+                            concurrency=4, rate=ARXIV_REQUESTS_PER_SECOND, timeout=30, retries=4, backoff=3):
+    """
+    Fetches up to max_results entries per query, page_size entries per request.
+
+    Queries run concurrently (at most `concurrency` at once) but every request draws from one
+    token bucket, so the overall request rate stays within arXiv's policy. Failed requests are
+    retried `retries` times with exponential backoff. on_page(query, response, error) is called
+    for every page as soon as it arrives.
+    """
+    bucket = TokenBucket(rate)
+    semaphore = asyncio.Semaphore(concurrency)
+    await asyncio.gather(*(
+        _fetch_query(query, on_page, bucket, semaphore, base_url, max_results, page_size, timeout, retries, backoff)
+        for query in queries
+    ))
 
+
+def fetch_arxiv(queries, max_results=100, **kwargs):
+    """Returns one {"query", "response"} dict per fetched page (with "error" instead when a query fails)."""
+    all_results = []
+
+    def _collect(query, response, error):
+        result = {"query": query, "response": response}
+        if error is not None:
+            result["error"] = error
+        all_results.append(result)
+
+    asyncio.run(fetch_arxiv_async(queries, _collect, max_results=max_results, **kwargs))
     return all_results
 
 
-def parse_et(response, query):
-    root = ET.fromstring(response)
-    ns = {
-        'atom': 'http://www.w3.org/2005/Atom',
-        'arxiv': 'http://arxiv.org/schemas/atom',
-    }
-    entries = []
-    for entry in root.findall('atom:entry', ns):
-        authors = [author.find('atom:name', ns).text
-                   for author in entry.findall('atom:author', ns)]
-        entry_data = {
-            'id': entry.find('atom:id', ns).text,
+def stream_arxiv(queries, sink, max_results=100, batch_size=1000, **kwargs):
+    """
+    Fetches all queries and hands the parsed entries to sink(df) in batches of batch_size rows.
+    Entries are parsed as they arrive and only batch_size of them are held at a time; ids
+    already seen for a query are skipped. Those per-query id sets are the one part that grows
+    with max_results, at one short string per entry.
+    """
+    seen = {}
+    batch = []
+    sent = 0
+
+    def _flush():
+        nonlocal sent
+        sink(pd.DataFrame(batch, columns=ENTRY_COLUMNS))
+        sent += len(batch)
+        batch.clear()
+
+    def _parse(query, response, error):
+        if not response:
+            return
+        ids = seen.setdefault(query, set())
+        for entry in iter_entries(response, query):
+            if entry['id'] in ids:
+                continue
+            ids.add(entry['id'])
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                _flush()
+
+    # The fetch is the longest step of the pipeline; rows_out is the number of entries handed to sink
+    with measure("get_arxiv.stream_arxiv") as record:
+        asyncio.run(fetch_arxiv_async(queries, _parse, max_results=max_results, **kwargs))
+        if batch:
+            _flush()
+        record["rows_out"] = sent
+
+
+def _text(elem, tag):
+    child = elem.find(tag)
+    return child.text if child is not None else None
+
+
+def iter_entries(response, query):
+    """
+    Yields one dict per <entry> of an Atom response (str, bytes or a binary file object).
+    Entries are cleared from the tree once yielded, so only the current one is held in memory.
+    """
+    if isinstance(response, str):
+        response = response.encode('utf-8')
+    if isinstance(response, bytes):
+        response = io.BytesIO(response)
+
+    root = None
+    for event, elem in ET.iterparse(response, events=('start', 'end')):
+        if root is None:
+            root = elem
+        if event != 'end' or elem.tag != _ENTRY:
+            continue
+        yield {
+            'id': _text(elem, _ATOM + 'id'),
             'technology': query,
-            'published': entry.find('atom:published', ns).text,
-            'updated': entry.find('atom:updated', ns).text,
-            'title': entry.find('atom:title', ns).text,
-            'summary': entry.find('atom:summary', ns).text,
-            'authors': authors
+            'published': _text(elem, _ATOM + 'published'),
+            'updated': _text(elem, _ATOM + 'updated'),
+            'title': _text(elem, _ATOM + 'title'),
+            'summary': _text(elem, _ATOM + 'summary'),
+            'authors': [_text(author, _ATOM + 'name') for author in elem.iterfind(_ATOM + 'author')],
         }
-        entries.append(entry_data)
+        root.clear()
 
-    df = pd.DataFrame(entries).drop_duplicates(subset='id').reset_index(drop=True)
 
-    return df
\ No newline at end of file
+def parse_et(response, query):
+    df = pd.DataFrame(iter_entries(response, query), columns=ENTRY_COLUMNS)
+    return df.drop_duplicates(subset='id').reset_index(drop=True)
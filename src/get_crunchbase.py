@@ -5,6 +5,10 @@ import os
 from kagglehub import KaggleDatasetAdapter
 import pandas as pd
 
+from src.instrumentation import instrumented
+
+
+@instrumented
 def fetch_crunchbase():
     """
     Fetches startup investment data from Crunchbase.
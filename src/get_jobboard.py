@@ -1,12 +1,17 @@
 from staffspy import LinkedInAccount, DriverType, BrowserType
 import kagglehub
-from kagglehub import KaggleDatasetAdapter
 import staffspy.utils.utils as staffspy_utils
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium import webdriver
 import os
 import getpass
+import threading
+import numpy as np
+import pandas as pd
+
+from src.clean_data import parse_skills_list
+from src.instrumentation import instrumented
 
 # --- MONKEY-PATCH ---
 # The original get_webdriver function in staffspy does not allow passing
@@ -39,27 +44,41 @@ staffspy_utils.get_webdriver = patched_get_webdriver
 
 # --- END OF PATCH ---
 
-# This global variable will hold our single, logged-in account instance.
-_account = None
+# One logged-in account per scraping thread (each drives its own browser);
+# credentials are prompted for once and shared.
+_local = threading.local()
+_credentials = None
+_credentials_lock = threading.Lock()
+
+
+def _get_credentials():
+    global _credentials
+    with _credentials_lock:
+        if _credentials is None:
+            print("First-time Jobboard call, prompting for login...")
+            _credentials = (input("Enter a LinkedIn email: "), getpass.getpass("Enter a LinkedIn password: "))
+        return _credentials
 
-# search by company
-def fetch_jobboard(startup: str, max=999):
-    global _account
 
-    # Lazy initialization: only create the account object if it doesn't exist yet.
-    if _account is None:
-        print("First-time Jobboard call, prompting for login...")
-        _account = LinkedInAccount(
+def _get_account():
+    # Lazy initialization: only create the account object if this thread has none yet.
+    if getattr(_local, "account", None) is None:
+        username, password = _get_credentials()
+        _local.account = LinkedInAccount(
             driver_type=DriverType(
                 browser_type=BrowserType.CHROME,
                 executable_path="/usr/local/bin/chromedriver" # Explicitly provide the path
             ),
-            username=input("Enter a LinkedIn email: "),
-            password=getpass.getpass("Enter a LinkedIn password: "),
+            username=username,
+            password=password,
             log_level=1
         )
+    return _local.account
 
-    staff = _account.scrape_staff(
+
+# search by company
+def fetch_jobboard(startup: str, max=999):
+    staff = _get_account().scrape_staff(
         company_name=startup,
         extra_profile_data=True,  # fetch all past experiences, schools, & skills
         max_results=max,  # can go up to 1000
@@ -71,20 +90,64 @@ def fetch_jobboard(startup: str, max=999):
     return staff
 
 
+KAGGLE_JOBS_DATASET = "asaniczka/1-3m-linkedin-jobs-and-skills-2024"
+
+
+def stream_title_skills(postings_path, skills_path, chunksize=100_000):
+    """
+    Builds the job_title -> skills table from the Kaggle postings and skills CSVs in chunks.
+
+    Postings are reduced to sorted (hashed job_link, interned title code) arrays, then
+    job_skills is streamed and joined on the hash, so neither file is ever fully in memory.
+    Those arrays still hold 16 bytes per posting (about 21 MB for the 1.3M postings); the
+    rest of the peak memory is the unique titles and their skills.
+
+    Returns:
+        pd.DataFrame: One row per job title with columns ['job_title', 'job_skills'] (comma-joined).
+    """
+    title_codes = {}
+    link_hashes, link_titles = [], []
+    for chunk in pd.read_csv(postings_path, usecols=["job_link", "job_title"], chunksize=chunksize):
+        chunk = chunk.dropna()
+        link_hashes.append(pd.util.hash_array(chunk["job_link"].to_numpy(dtype=object)))
+        link_titles.append(np.fromiter(
+            (title_codes.setdefault(t, len(title_codes)) for t in chunk["job_title"]),
+            dtype=np.int64, count=len(chunk),
+        ))
+    link_hashes = np.concatenate(link_hashes) if link_hashes else np.array([], dtype=np.uint64)
+    link_titles = np.concatenate(link_titles) if link_titles else np.array([], dtype=np.int64)
+    order = np.argsort(link_hashes)
+    link_hashes, link_titles = link_hashes[order], link_titles[order]
+
+    title_skills = {}
+    for chunk in pd.read_csv(skills_path, usecols=["job_link", "job_skills"], chunksize=chunksize):
+        chunk = chunk.dropna()
+        hashes = pd.util.hash_array(chunk["job_link"].to_numpy(dtype=object))
+        pos = np.searchsorted(link_hashes, hashes).clip(max=max(len(link_hashes) - 1, 0))
+        found = (link_hashes[pos] == hashes) if len(link_hashes) else np.zeros(len(hashes), dtype=bool)
+        pairs = pd.DataFrame({
+            "title": link_titles[pos[found]],
+            "skill": chunk["job_skills"].to_numpy()[found],
+        })
+        pairs["skill"] = pairs["skill"].map(parse_skills_list)
+        pairs = pairs.explode("skill").dropna().drop_duplicates()
+        for code, skills in pairs.groupby("title")["skill"]:
+            title_skills.setdefault(code, set()).update(skills)
+
+    titles = {code: title for title, code in title_codes.items()}
+    return pd.DataFrame({
+        "job_title": [titles[code] for code in title_skills],
+        "job_skills": [", ".join(sorted(skills)) for skills in title_skills.values()],
+    })
+
+
 # Job posting and skills scraped from a jobboard via Kaggle dataset in 2024
-def fetch_kaggle():
-    jobs_skills = kagglehub.dataset_load(
-        KaggleDatasetAdapter.PANDAS,
-        "asaniczka/1-3m-linkedin-jobs-and-skills-2024",
-        "job_skills.csv",
-    )
-    jobs_skills = jobs_skills.set_index('job_link')
-    job_postings = kagglehub.dataset_load(
-        KaggleDatasetAdapter.PANDAS,
-        "asaniczka/1-3m-linkedin-jobs-and-skills-2024",
-        "linkedin_job_postings.csv",
-        pandas_kwargs={"usecols": ["job_link", "job_title"]}
+@instrumented
+def fetch_kaggle(chunksize=100_000):
+    """Downloads the Kaggle dataset and streams it into one row of skills per job title."""
+    path = kagglehub.dataset_download(KAGGLE_JOBS_DATASET)
+    return stream_title_skills(
+        os.path.join(path, "linkedin_job_postings.csv"),
+        os.path.join(path, "job_skills.csv"),
+        chunksize,
     )
-    job_postings = job_postings.set_index('job_link')
-    job_postings_skills = jobs_skills.join(job_postings, how='inner')
-    return job_postings_skills
\ No newline at end of file
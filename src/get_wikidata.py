@@ -1,64 +1,233 @@
-import requests
-import pandas as pd
+import json
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.cache import atomic_write
+from src.instrumentation import instrumented
+
+WIKIDATA_API_URL = "https://www.wikidata.org/w/api.php"
+HEADERS = {"User-Agent": "EmergingTechGraph/1.0 (qx31aw2cg@mozmail.com)"}  # helps avoid getting blocked — can personalize it
+# On-disk cache of search results and entities, so re-runs only query names that are new or expired
+WIKIDATA_CACHE_FILE = os.getenv("WIKIDATA_CACHE", "data/.wikidata_cache.json")
+WIKIDATA_CACHE_TTL = float(os.getenv("WIKIDATA_CACHE_TTL_DAYS", "30")) * 86400
+# wbgetentities accepts at most 50 ids per request
+ENTITY_BATCH_SIZE = 50
+
+
+class WikidataError(Exception):
+    pass
+
+
+class AdaptiveRateLimiter:
+    """
+    Spaces requests from all threads at least `interval` seconds apart.
+    The interval doubles whenever Wikidata throttles us (HTTP 429 or a maxlag error, honouring
+    Retry-After) and shrinks back towards min_interval while requests succeed.
+    """
+
+    def __init__(self, min_interval, max_interval=60.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        time.sleep(slot - now)
+
+    def success(self):
+        with self.lock:
+            self.interval = max(self.min_interval, self.interval * 0.9)
+
+    def throttled(self, retry_after=None):
+        with self.lock:
+            self.interval = min(self.max_interval, max(self.interval * 2, self.min_interval, 0.1))
+            pause = max(self.interval, retry_after or 0)
+            self.next_slot = max(self.next_slot, time.monotonic() + pause)
+        print(f"   ... Wikidata is throttling, request interval now {self.interval:.2f}s")
+
+
+def make_session(pool_size=8, retries=3):
+    """One pooled keep-alive session for all requests; connection errors and 5xx are retried by urllib3."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    retry = Retry(total=retries, backoff_factor=1, status_forcelist=(500, 502, 503, 504), allowed_methods=("GET",),
+                  respect_retry_after_header=False)  # 429s are handled by the rate limiter
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get("Retry-After", 0))
+    except ValueError:
+        return 0
+
+
+def _api_get(session, limiter, params, url=WIKIDATA_API_URL, attempts=5, timeout=30):
+    """GET against the Wikidata API with the shared limiter, backing off while throttled."""
+    params = {"format": "json", "maxlag": 5, **params}
+    for _ in range(attempts):
+        limiter.wait()
+        response = session.get(url, params=params, timeout=timeout)
+        if response.status_code == 429:
+            limiter.throttled(_retry_after(response))
+            continue
+        response.raise_for_status()
+        data = response.json()
+        error = data.get("error")
+        if error and error.get("code") == "maxlag":
+            limiter.throttled(_retry_after(response))
+            continue
+        if error:
+            raise WikidataError(error.get("info", error.get("code")))
+        limiter.success()
+        return data
+    raise WikidataError(f"still throttled after {attempts} attempts")
+
+
+def _search(session, limiter, name, url):
+    data = _api_get(session, limiter, {"action": "wbsearchentities", "language": "en", "search": name}, url)
+    return [
+        {
+            "qid": entry.get("id"),
+            "label": entry.get("label"),
+            "description": entry.get("description"),
+            "match_type": entry.get("match", {}).get("type", ""),
+        }
+        for entry in data.get("search", [])
+    ]
+
+
+def _get_entities(session, limiter, qids, url):
+    data = _api_get(session, limiter, {
+        "action": "wbgetentities",
+        "ids": "|".join(qids),
+        "props": "labels|descriptions|aliases",
+        "languages": "en",
+    }, url)
+    entities = {}
+    for qid, entity in data.get("entities", {}).items():
+        entities[qid] = {
+            "label": entity.get("labels", {}).get("en", {}).get("value"),
+            "description": entity.get("descriptions", {}).get("en", {}).get("value"),
+            "aliases": [a["value"] for a in entity.get("aliases", {}).get("en", [])],
+        }
+    return entities
+
+
+def _load_cache(path):
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"search": {}, "entities": {}}
+
 
-def fetch_wikidata(tech_names, delay=0.5, top_n=1):
+def _save_cache(cache, path):
+    with atomic_write(path) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+
+
+def _fresh(section, key, ttl, now):
+    item = section.get(key)
+    return item is not None and now - item["fetched"] < ttl
+
+
+@instrumented
+def fetch_wikidata(tech_names, delay=0.5, top_n=1, workers=4, cache_path=WIKIDATA_CACHE_FILE,
+                   ttl=WIKIDATA_CACHE_TTL, url=WIKIDATA_API_URL):
     """
     Fetches QID, label, and description for each technology name from Wikidata.
     Not meant for data mining — just entity discovery. From the QIDs, you can get the full data.
 
+    Names are searched concurrently over one pooled session, then the label, description and
+    aliases of all resolved QIDs are fetched with batched wbgetentities calls. Both are kept in
+    an on-disk cache for `ttl` seconds, so only new or expired names hit the network.
+
     Parameters:
         tech_names (list of str): List of emerging technology names.
-        delay (float): Delay between API requests to avoid rate-limiting.
+        delay (float): Minimum delay between API requests, raised automatically when throttled.
         top_n (int): Number of top search results to return per term (default 1).
+        workers (int): Number of concurrent requests.
+        cache_path (str): JSON response cache, None to disable.
+        ttl (float): Seconds before a cached response is fetched again.
 
     Returns:
-        pd.DataFrame: DataFrame with columns ['name', 'qid', 'label', 'description', 'match_type']
+        pd.DataFrame: DataFrame with columns ['name', 'qid', 'label', 'description', 'match_type', 'aliases']
     """
-    url = "https://www.wikidata.org/w/api.php"
-    headers = {"User-Agent": "EmergingTechGraph/1.0 (qx31aw2cg@mozmail.com)"} # helps avoid getting blocked — can personalize it
-    results = []
+    cache = _load_cache(cache_path)
+    now = time.time()
+    session = make_session(pool_size=workers)
+    limiter = AdaptiveRateLimiter(delay)
 
-    for name in tech_names:
-        params = {
-            "action": "wbsearchentities",
-            "language": "en",
-            "format": "json",
-            "search": name
-        }
+    names = list(dict.fromkeys(tech_names))
+    to_search = [name for name in names if not _fresh(cache["search"], name, ttl, now)]
 
+    def _search_one(name):
         try:
-            response = requests.get(url, params=params, headers=headers)
-            data = response.json()
-
-            if "search" in data:
-                for entry in data["search"][:top_n]:
-                    results.append({
-                        "name": name,
-                        "qid": entry.get("id"),
-                        "label": entry.get("label"),
-                        "description": entry.get("description"),
-                        "match_type": entry.get("match", {}).get("type", "")
-                    })
-            else:
-                results.append({
-                    "name": name,
-                    "qid": None,
-                    "label": None,
-                    "description": None,
-                    "match_type": "no match"
-                })
-
-            time.sleep(delay)
-
+            return name, _search(session, limiter, name, url)
         except Exception as e:
             print(f"Error while processing '{name}':", str(e))
+            return name, None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for name, hits in pool.map(_search_one, to_search):
+            if hits is not None:
+                cache["search"][name] = {"fetched": now, "results": hits}
+
+        qids = {
+            hit["qid"]
+            for name in names if name in cache["search"]
+            for hit in cache["search"][name]["results"][:top_n]
+        }
+        to_get = sorted(q for q in qids if q and not _fresh(cache["entities"], q, ttl, now))
+        batches = [to_get[i:i + ENTITY_BATCH_SIZE] for i in range(0, len(to_get), ENTITY_BATCH_SIZE)]
+
+        def _get_batch(batch):
+            try:
+                return _get_entities(session, limiter, batch, url)
+            except Exception as e:
+                print(f"Error while fetching entities {batch[0]}..{batch[-1]}:", str(e))
+                return {}
+
+        for entities in pool.map(_get_batch, batches):
+            for qid, entity in entities.items():
+                cache["entities"][qid] = {"fetched": now, **entity}
+
+    if cache_path:
+        _save_cache(cache, cache_path)
+    print(f"   ✓ Wikidata: {len(names) - len(to_search)} names from cache, {len(to_search)} searched, "
+          f"{len(to_get)} entities fetched in {len(batches)} batches")
+
+    results = []
+    for name in tech_names:
+        if name not in cache["search"]:  # failed and never fetched before; stale entries are reused
+            results.append({"name": name, "qid": None, "label": None, "description": None,
+                            "match_type": "error", "aliases": None})
+            continue
+        for hit in cache["search"][name]["results"][:top_n]:
+            entity = cache["entities"].get(hit["qid"], {})
             results.append({
                 "name": name,
-                "qid": None,
-                "label": None,
-                "description": None,
-                "match_type": "error"
+                "qid": hit["qid"],
+                "label": entity.get("label") or hit["label"],
+                "description": entity.get("description") or hit["description"],
+                "match_type": hit["match_type"],
+                "aliases": "|".join(entity.get("aliases", [])),
             })
 
-    return pd.DataFrame(results)
+    return pd.DataFrame(results, columns=["name", "qid", "label", "description", "match_type", "aliases"])
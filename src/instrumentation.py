@@ -0,0 +1,196 @@
+"""
+Per-step instrumentation for the pipeline.
+
+Every measured step records wall time, CPU time, peak resident memory and input/output row
+counts. Records are collected per process; the stage runner ships them from the worker
+processes back to the main one, which writes them as a JSON run report. Two reports can be
+compared to spot regressions:
+
+    python -m src.instrumentation data/run_reports/old.json data/run_reports/new.json
+"""
+
+import functools
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+
+RUN_REPORT_DIR = os.getenv("RUN_REPORT_DIR", "data/run_reports")
+# How often the memory sampler reads the current RSS
+RSS_SAMPLE_INTERVAL = 0.05
+
+_records = []
+_records_lock = threading.Lock()
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _current_rss():
+    """Current resident set size in bytes, None where /proc is not available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        return None
+
+
+def _max_rss():
+    """Process high-water mark in bytes (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _PeakRSS:
+    """Samples the RSS on a background thread, giving the peak of one step rather than of the process."""
+
+    def __init__(self):
+        self.peak = _current_rss()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        if self.peak is not None:
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(RSS_SAMPLE_INTERVAL):
+            self.peak = max(self.peak, _current_rss() or 0)
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self.peak = max(self.peak, _current_rss() or 0)
+        else:
+            self.peak = _max_rss()
+
+
+def count_rows(value):
+    """Rows in a DataFrame/Series, summed over tuples and lists of them; None if there are none."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        counts = [count_rows(v) for v in value]
+        counts = [c for c in counts if c is not None]
+        return sum(counts) if counts else None
+    return None
+
+
+@contextmanager
+def measure(name, rows_in=None):
+    """
+    Measures the enclosed block. Yields the record, so the block can fill in rows_out:
+
+        with measure("load_graph.Paper", rows_in=len(rows)) as rec:
+            ...
+            rec["rows_out"] = written
+    """
+    record = {"name": name, "pid": os.getpid(), "rows_in": rows_in, "rows_out": None}
+    wall, cpu = time.perf_counter(), time.process_time()
+    rss = _PeakRSS()
+    try:
+        with rss:
+            yield record
+    finally:
+        record["wall_s"] = round(time.perf_counter() - wall, 4)
+        record["cpu_s"] = round(time.process_time() - cpu, 4)
+        record["peak_rss_mb"] = round(rss.peak / 2**20, 1)
+        with _records_lock:
+            _records.append(record)
+
+
+def instrumented(func=None, name=None):
+    """Decorator: measures every call, counting DataFrame rows in the arguments and the result."""
+    if func is None:
+        return functools.partial(instrumented, name=name)
+
+    label = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with measure(label, rows_in=count_rows(list(args) + list(kwargs.values()))) as record:
+            result = func(*args, **kwargs)
+            record["rows_out"] = count_rows(result)
+        return result
+    return wrapper
+
+
+def collect():
+    """Returns and clears the records of this process."""
+    with _records_lock:
+        records = list(_records)
+        _records.clear()
+    return records
+
+
+def add_records(records):
+    """Adds records measured in another process."""
+    with _records_lock:
+        _records.extend(records)
+
+
+def write_report(path=None, meta=None):
+    """Writes (and clears) the collected records as a JSON run report and returns its path."""
+    started = datetime.now(timezone.utc)
+    if path is None:
+        os.makedirs(RUN_REPORT_DIR, exist_ok=True)
+        path = os.path.join(RUN_REPORT_DIR, f"run-{started:%Y%m%dT%H%M%S}.json")
+    report = {"finished": started.isoformat(timespec="seconds"), "meta": meta or {}, "steps": collect()}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"   ✓ Run report with {len(report['steps'])} steps written to {path}")
+    return path
+
+
+def _keyed(steps):
+    """Steps keyed by name, numbering repeated names (match_startups_to_techs#2) so runs line up."""
+    seen, keyed = {}, {}
+    for step in steps:
+        n = seen[step["name"]] = seen.get(step["name"], 0) + 1
+        keyed[step["name"] if n == 1 else f"{step['name']}#{n}"] = step
+    return keyed
+
+
+def compare_reports(old_path, new_path, threshold=0.2, min_seconds=0.5):
+    """
+    Prints a step-by-step comparison of two run reports and returns the regressions:
+    steps whose wall time or peak RSS grew by more than `threshold` (ignoring steps
+    shorter than min_seconds), or whose output row count changed.
+    """
+    with open(old_path, encoding="utf-8") as f:
+        old = _keyed(json.load(f)["steps"])
+    with open(new_path, encoding="utf-8") as f:
+        new = _keyed(json.load(f)["steps"])
+
+    regressions = []
+    print(f"{'step':<44}{'wall s':>16}{'peak MB':>18}{'rows out':>20}")
+    for key in list(old) + [k for k in new if k not in old]:
+        a, b = old.get(key), new.get(key)
+        if a is None or b is None:
+            print(f"{key:<44}{'only in ' + ('new' if a is None else 'old'):>16}")
+            continue
+        flags = []
+        if max(a["wall_s"], b["wall_s"]) >= min_seconds and b["wall_s"] > a["wall_s"] * (1 + threshold):
+            flags.append("time")
+        if b["peak_rss_mb"] > a["peak_rss_mb"] * (1 + threshold):
+            flags.append("memory")
+        if a["rows_out"] != b["rows_out"]:
+            flags.append("rows")
+        if flags:
+            regressions.append({"step": key, "flags": flags, "old": a, "new": b})
+        print(f"{key:<44}{a['wall_s']:>7.2f} -> {b['wall_s']:<7.2f}{a['peak_rss_mb']:>8.0f} -> {b['peak_rss_mb']:<7.0f}"
+              f"{str(a['rows_out']):>9} -> {str(b['rows_out']):<8}{'  <- ' + ', '.join(flags) if flags else ''}")
+    return regressions
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m src.instrumentation OLD_REPORT NEW_REPORT")
+    sys.exit(1 if compare_reports(sys.argv[1], sys.argv[2]) else 0)
@@ -0,0 +1,196 @@
+"""
+Resumable jobboard scraping.
+
+Every startup is a job in a SQLite queue (pending -> running -> done/failed). A configurable
+number of workers claim jobs, share one rate limiter, and append each startup's staff to a
+partial file next to the output CSV as soon as it is scraped. After a crash the next run resets
+interrupted jobs to pending and continues with the startups that are not done yet; any other
+run starts over with an empty queue and an empty partial file. The partial file replaces the
+output CSV only once the queue is drained and it holds rows, so a scrape that collects nothing
+leaves the previous output in place.
+"""
+
+import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+JOBBOARD_QUEUE_FILE = os.getenv("JOBBOARD_QUEUE", "data/.jobboard_queue.sqlite")
+JOBBOARD_WORKERS = int(os.getenv("JOBBOARD_WORKERS", "1"))
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+
+class JitteredRateLimiter:
+    """Starts at most one request every uniform(min_delay, max_delay) seconds across all workers."""
+
+    def __init__(self, min_delay, max_delay):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + random.uniform(self.min_delay, self.max_delay)
+        time.sleep(slot - now)
+
+
+class JobQueue:
+    """Per-startup job state in SQLite. All access goes through one connection guarded by a lock."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                startup TEXT PRIMARY KEY,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                staff_rows INTEGER,
+                error TEXT,
+                updated_at REAL
+            )
+            """
+        )
+
+    def _execute(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def enqueue(self, startups):
+        """Adds startups that are not queued yet; existing jobs keep their state."""
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO jobs (startup, updated_at) VALUES (?, ?)",
+                [(s, time.time()) for s in startups],
+            )
+
+    def recover(self):
+        """Jobs left running by a crashed run are handed out again."""
+        self._execute("UPDATE jobs SET status = ? WHERE status = ?", (PENDING, RUNNING))
+
+    def reset(self):
+        self._execute("DELETE FROM jobs")
+
+    def interrupted(self):
+        """True when a previous run stopped with jobs still pending or running."""
+        return bool(self._execute("SELECT 1 FROM jobs WHERE status IN (?, ?) LIMIT 1", (PENDING, RUNNING)))
+
+    def claim(self):
+        """Marks the next pending job as running and returns its startup, or None when the queue is drained."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT startup FROM jobs WHERE status = ? ORDER BY rowid LIMIT 1", (PENDING,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE startup = ?",
+                (RUNNING, time.time(), row[0]),
+            )
+            return row[0]
+
+    def done(self, startup, staff_rows):
+        self._execute(
+            "UPDATE jobs SET status = ?, staff_rows = ?, error = NULL, updated_at = ? WHERE startup = ?",
+            (DONE, staff_rows, time.time(), startup),
+        )
+
+    def fail(self, startup, error, max_attempts):
+        """Puts the job back in the queue, or marks it failed once it has used up max_attempts."""
+        self._execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, error = ?, updated_at = ? "
+            "WHERE startup = ?",
+            (max_attempts, FAILED, PENDING, error, time.time(), startup),
+        )
+
+    def counts(self):
+        return dict(self._execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+
+    def close(self):
+        self.conn.close()
+
+
+def scrape_jobboard(startups, fetch, out_path, queue_path=JOBBOARD_QUEUE_FILE, workers=JOBBOARD_WORKERS,
+                    max_staff=999, min_delay=5, max_delay=15, max_attempts=3):
+    """
+    Scrapes fetch(startup, max_staff) for every startup and writes the staff rows to out_path.
+
+    Rows are appended to `{out_path}.partial` while the run goes on. The queue at queue_path
+    remembers which startups are done, so calling this again after an interruption only scrapes
+    the rest; otherwise (a new queue or a drained one) a new run starts from an empty queue and
+    partial file. Once the queue is drained, the partial file replaces out_path if it has rows;
+    if it has none, out_path is left untouched.
+    fetch must return a DataFrame; its 'start_up' column is overwritten with the queued name.
+
+    Returns:
+        pd.DataFrame: The staff rows of this run (empty if nothing was scraped).
+    """
+    partial_path = f"{out_path}.partial"
+    queue = JobQueue(queue_path)
+    if queue.interrupted():
+        print(f"\nResuming the interrupted jobboard scrape into {partial_path}")
+    else:
+        queue.reset()
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+    queue.recover()
+    queue.enqueue(startups)
+
+    counts = queue.counts()
+    total = sum(counts.values())
+    print(f"\nJobboard queue: {counts.get(DONE, 0)}/{total} startups done, "
+          f"{counts.get(PENDING, 0)} pending, {counts.get(FAILED, 0)} failed. Using {workers} worker(s).")
+
+    limiter = JitteredRateLimiter(min_delay, max_delay)
+    write_lock = threading.Lock()
+
+    def _worker():
+        while True:
+            startup = queue.claim()
+            if startup is None:
+                return
+            limiter.wait()
+            print(f"Scraping jobboard for '{startup}'...")
+            try:
+                staff = fetch(startup, max_staff)
+            except Exception as e:
+                print(f"   ... failed to scrape '{startup}': {e}")
+                queue.fail(startup, str(e), max_attempts)
+                continue
+            if not staff.empty:
+                # Overwrite the scraped name with the canonical name from our list
+                # to ensure data consistency.
+                staff = staff.assign(start_up=startup)
+            # Appends are serialised so rows of concurrent workers never interleave
+            with write_lock:
+                if not staff.empty:
+                    staff.to_csv(partial_path, index=False, mode="a", header=not os.path.exists(partial_path))
+                queue.done(startup, len(staff))
+            print(f"   ... '{startup}' done ({len(staff)} staff)")
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(_worker) for _ in range(workers)]:
+                future.result()
+        counts = queue.counts()
+    finally:
+        queue.close()
+    print(f"✓ Jobboard queue drained: {counts.get(DONE, 0)} done, {counts.get(FAILED, 0)} failed")
+
+    if not os.path.exists(partial_path):
+        return pd.DataFrame()
+    # A crash between appending and marking done re-scrapes that startup; drop its repeated rows
+    staff = pd.read_csv(partial_path).drop_duplicates(ignore_index=True)
+    os.replace(partial_path, out_path)
+    return staff
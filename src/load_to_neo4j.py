@@ -1,140 +1,408 @@
 """
 Super small loader using neo4j-driver.
-Assumes Neo4j is reachable at bolt://localhost:7687
+Connects through the shared driver of src.neo4j_connection (NEO4J_URI, default bolt://neo4j:7687).
+
+Every node and edge type is written with `UNWIND $rows` in batches of
+`NEO4J_BATCH_SIZE` rows, so a full load needs a few dozen round trips
+instead of one per row. By default each batch is committed on its own and
+progress is checkpointed to `NEO4J_LOAD_STATE`, so an interrupted load
+resumes from the last committed batch. Edges are written by
+`NEO4J_LOAD_WORKERS` parallel sessions once all nodes exist.
 """
 
-from neo4j import GraphDatabase
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import hashlib
+import json
 import os
+import time
+import zlib
 import pandas as pd
 
-URI = os.getenv("NEO4J_URI", "bolt://neo4j:7687")   # default works in Docker network
-USER = os.getenv("NEO4J_USER", "neo4j")
-PWD  = os.getenv("NEO4J_PASSWORD", "password")
+from src.cache import atomic_write
+from src.instrumentation import measure
+from src.neo4j_connection import get_driver, report_pool_metrics, MAX_POOL_SIZE
+from src.neo4j_schema import ensure_schema, report_index_usage, uses_index_seek
+from src.startup_schema import normalise_names, startup_ids
+
+BATCH_SIZE = int(os.getenv("NEO4J_BATCH_SIZE", "1000"))
+CHUNKED_COMMIT = os.getenv("NEO4J_CHUNKED_COMMIT", "true").lower() in ("1", "true", "yes", "y")
+LOAD_STATE_FILE = os.getenv("NEO4J_LOAD_STATE", "data/.load_state.json")
+LOAD_WORKERS = int(os.getenv("NEO4J_LOAD_WORKERS", "4"))
+
+
+# ---------- Cypher ---------------------------------------------------
+
+TECH_QUERY = """
+UNWIND $rows AS row
+MERGE (t:Technology {tech_id: row.qid})
+SET t.tech = row.name,
+    t.name = row.label,
+    t.description = row.description
+"""
+
+PAPER_QUERY = """
+UNWIND $rows AS row
+MERGE (p:Paper {paper_id: row.paper_id})
+SET p.arxiv_url = row.id,
+    p.title = row.title,
+    p.summary = row.summary,
+    p.published = date(row.published)
+"""
+
+MENTIONS_QUERY = """
+UNWIND $rows AS row
+MATCH (p:Paper {paper_id: row.paper_id})
+MATCH (t:Technology {tech_id: row.qid})
+MERGE (p)-[:MENTIONS]->(t)
+"""
+
+AUTHOR_QUERY = """
+UNWIND $rows AS row
+MERGE (a:Author {author_id: row.author_id})
+SET a.name = row.name
+"""
+
+AUTHORED_QUERY = """
+UNWIND $rows AS row
+MATCH (a:Author {author_id: row.author_id})
+MATCH (p:Paper {paper_id: row.paper_id})
+MERGE (a)-[:AUTHORED]->(p)
+"""
+
+STARTUP_QUERY = """
+UNWIND $rows AS row
+MERGE (s:Startup {name: row.name})
+SET s.startup_id = row.startup_id,
+    s.original_name = row.original_name,
+    s.description = row.description,
+    s.industries = row.industries,
+    s.region = row.region,
+    s.website = row.website,
+    s.homepage = row.homepage,
+    s.founded_date = date(row.founded_date),
+    s.num_employees = row.num_employees,
+    s.funding_total = row.funding_total,
+    s.funding_currency = row.funding_currency,
+    s.operating_status = row.operating_status,
+    s.company_type = row.company_type,
+    s.location = row.location,
+    s.status = row.status,
+    s.category = row.category
+"""
+
+USES_QUERY = """
+UNWIND $rows AS row
+MATCH (s:Startup {startup_id: row.startup_id})
+MATCH (t:Technology {tech_id: row.qid})
+MERGE (s)-[:USES]->(t)
+"""
+
+SKILL_QUERY = """
+UNWIND $rows AS row
+MERGE (s:Skill {name: row.skill_clean})
+"""
+
+HAS_SKILL_QUERY = """
+UNWIND $rows AS row
+MATCH (st:Startup {startup_id: row.startup_id})
+MATCH (sk:Skill {name: row.skill_clean})
+MERGE (st)-[:HAS_SKILL]->(sk)
+"""
+
+# Edge type -> (start node key, end node key) in its parameter rows
+EDGE_ENDPOINTS = {
+    "MENTIONS": ("paper_id", "qid"),
+    "AUTHORED": ("author_id", "paper_id"),
+    "USES": ("startup_id", "qid"),
+    "HAS_SKILL": ("startup_id", "skill_clean"),
+}
+
+
+# ---------- row conversion ------------------------------------------
+
+def _col(df, name, default=''):
+    """Column `name` of df, or a constant column when the source lacks it (like row.get)."""
+    if name in df.columns:
+        return df[name]
+    return pd.Series(default, index=df.index, dtype=object)
+
+
+def _records(df):
+    """DataFrame -> list of parameter dicts, with NaN/NaT/NA sent as null."""
+    df = df.astype(object)
+    return df.where(df.notna(), None).to_dict("records")
+
+
+def _iso_date(series):
+    return pd.to_datetime(series).dt.strftime("%Y-%m-%d")
+
+
+def tech_rows(tech_df):
+    return _records(tech_df.dropna(subset=["qid"])[["qid", "name", "label", "description"]])
+
+
+def paper_rows(paper_df):
+    rows = paper_df[["paper_id", "id", "title", "summary"]].copy()
+    rows["published"] = _iso_date(paper_df["published"])
+    return _records(rows)
+
+
+def mentions_rows(edge_df):
+    return _records(edge_df.dropna(subset=["paper_id", "qid"])[["paper_id", "qid"]])
+
+
+def author_rows(paper_authors_df):
+    # Authors are deduplicated on their name key; the first spelling seen names the node
+    authors = paper_authors_df.drop_duplicates("author_id")
+    return _records(pd.DataFrame({"author_id": authors["author_id"], "name": authors["author"]}))
+
 
+def authored_rows(paper_authors_df):
+    return _records(paper_authors_df[["author_id", "paper_id"]])
 
-def load_graph(tech_df, paper_df, edge_df, startups_df, matches_df, startup_skills_df, LOAD_SKILLS=False):
-    # print(tech_df.head())
-    # print(tech_df.columns)
-    driver = GraphDatabase.driver(URI, auth=(USER, PWD))
+
+def startup_rows(startups_df):
+    cb_name = _col(startups_df, "original_name_cb_info", None)
+    location = _col(startups_df, "location_extracted")
+    about = _col(startups_df, "about").fillna("").astype(str)
+    long_description = _col(startups_df, "long_description").fillna("").astype(str)
+    funding_total = _col(startups_df, "funding_total_usd", None)
+
+    name = startups_df["name"].str.strip()
+    rows = pd.DataFrame({
+        "name": name,
+        "startup_id": startups_df["startup_id"] if "startup_id" in startups_df.columns else startup_ids(name),
+        "original_name": cb_name.where(cb_name.notna() & cb_name.map(bool), _col(startups_df, "original_name_yc")),
+        "description": about + ". " + long_description,
+        "industries": _col(startups_df, "industries"),
+        # Handle for unknown locations
+        "region": _col(startups_df, "region").astype(object).where(location.map(bool), "Unknown"),
+        "website": _col(startups_df, "website"),
+        "homepage": _col(startups_df, "homepage_url"),
+        "founded_date": _iso_date(startups_df["founded_date_parsed"]),
+        "num_employees": _col(startups_df, "num_employees"),
+        "funding_total": pd.to_numeric(funding_total, errors="coerce"),
+        "funding_currency": _col(startups_df, "funding_currency"),
+        "operating_status": _col(startups_df, "operating_status"),
+        "company_type": _col(startups_df, "company_type"),
+        "location": location,
+        "status": _col(startups_df, "status"),
+        "category": _col(startups_df, "category_list"),
+    }, index=startups_df.index)
+    return _records(rows)
+
+
+def uses_rows(matches_df):
+    matches_df = matches_df.dropna(subset=["qid"])
+    rows = pd.DataFrame({"startup_id": startup_ids(matches_df["startup_name"].str.strip()), "qid": matches_df["qid"]})
+    return _records(rows)
+
+
+def skill_rows(startup_skills_df):
+    return _records(startup_skills_df[["skill_clean"]].drop_duplicates())
+
+
+def has_skill_rows(startup_skills_df):
+    # start_up is the name the startup was scraped under, so it is normalized like Startup.name
+    rows = pd.DataFrame({
+        "startup_id": startup_ids(normalise_names(startup_skills_df["start_up"])),
+        "skill_clean": startup_skills_df["skill_clean"],
+    })
+    return _records(rows)
+
+
+def _chunks(rows, batch_size):
+    """Yield successive lists of at most batch_size rows."""
+    it = iter(rows)
+    while batch := list(islice(it, batch_size)):
+        yield batch
+
+
+def graph_entities(tech_df, paper_df, edge_df, startups_df, matches_df, startup_skills_df, LOAD_SKILLS=False,
+                   paper_authors_df=None):
+    """
+    Ordered load plan: (entity, query, rows, log message) for every node and edge type.
+    Nodes come before the edges that MATCH them. Authors are loaded when paper_authors_df
+    (paper_id, author_id, author pairs from clean_data.iter_paper_authors) is given.
+    """
+    entities = [
+        ("Technology", TECH_QUERY, tech_rows(tech_df), "Loaded {n} Technology nodes"),
+        ("Paper", PAPER_QUERY, paper_rows(paper_df), "Loaded {n} Paper nodes"),
+        ("MENTIONS", MENTIONS_QUERY, mentions_rows(edge_df), "Created {n} Paper-Technology relationships"),
+    ]
+    if paper_authors_df is not None:
+        entities += [
+            ("Author", AUTHOR_QUERY, author_rows(paper_authors_df), "Loaded {n} Author nodes"),
+            ("AUTHORED", AUTHORED_QUERY, authored_rows(paper_authors_df), "Created {n} Author-AUTHORED-Paper relationships"),
+        ]
+    entities += [
+        ("Startup", STARTUP_QUERY, startup_rows(startups_df), "Loaded {n} Startup nodes from ALL startups"),
+        ("USES", USES_QUERY, uses_rows(matches_df), "Created {n} Startup-Technology relationships"),
+    ]
+    if LOAD_SKILLS:
+        entities += [
+            ("Skill", SKILL_QUERY, skill_rows(startup_skills_df), "Loaded {n} Skill nodes"),
+            ("HAS_SKILL", HAS_SKILL_QUERY, has_skill_rows(startup_skills_df), "Created {n} Startup-HAS_SKILL-Skill relationships"),
+        ]
+    return entities
+
+
+# ---------- parallel edges ------------------------------------------
+
+def _bucket(value, n):
+    # crc32 instead of hash(): stable across processes, so a resumed load partitions identically
+    return zlib.crc32(str(value).encode()) % n
+
+
+def partition_edges(rows, start_key, end_key, workers):
+    """
+    Splits edge rows into `workers` rounds of `workers` cells each.
+
+    Start and end nodes are hashed into `workers` buckets; round r holds the cells
+    (i, (i + r) % workers). Within a round no two cells share a start bucket or an end
+    bucket, so concurrent writers never lock the same node and cannot deadlock each other.
+    """
+    cells = [[[] for _ in range(workers)] for _ in range(workers)]
+    for row in rows:
+        i = _bucket(row[start_key], workers)
+        j = _bucket(row[end_key], workers)
+        cells[(j - i) % workers][i].append(row)
+    return cells
+
+
+def _write_cell(driver, query, rows, batch_size):
+    """Writes one partition cell from its own session; execute_write retries transient deadlocks."""
+    with driver.session() as sess:
+        for batch in _chunks(rows, batch_size):
+            sess.execute_write(_run_batch, query, batch)
+
+
+# ---------- checkpointing -------------------------------------------
+
+def _fingerprint(entities, batch_size, workers=1):
+    """Hash of the load plan; a checkpoint is only reused for the exact same rows, batch size and partitioning."""
+    h = hashlib.sha1(f"{batch_size}/{workers}".encode())
+    for entity, _, rows, _ in entities:
+        h.update(entity.encode())
+        h.update(json.dumps(rows, default=str, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def _read_load_state(path, fingerprint):
+    """Committed batch count per entity from a previous, interrupted load of the same data."""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if state.get("fingerprint") != fingerprint:
+        print("   NOTICE: Load checkpoint is for different data, starting from scratch.")
+        return {}
+    return state.get("committed", {})
+
+
+def _write_load_state(path, fingerprint, committed):
+    with atomic_write(path) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "committed": committed}, f)
+
+
+def _run_batch(tx, query, batch):
+    tx.run(query, rows=batch).consume()
+
+
+def load_graph(tech_df, paper_df, edge_df, startups_df, matches_df, startup_skills_df, LOAD_SKILLS=False,
+               paper_authors_df=None, batch_size=BATCH_SIZE, chunked=CHUNKED_COMMIT, state_file=LOAD_STATE_FILE, schema=True,
+               workers=LOAD_WORKERS):
+    """
+    Loads all nodes and edges with batched UNWIND statements.
+
+    schema=True first creates the constraints and indexes from src.neo4j_schema, so
+    every MERGE and edge MATCH is an index seek, and reports index usage afterwards.
+
+    chunked=True commits every batch in its own transaction and records the number of
+    committed batches per entity in state_file, so database memory stays bounded by
+    batch_size and a rerun after a failure skips what is already committed.
+    chunked=False writes everything in a single transaction.
+
+    With chunked commits and workers > 1, edges are partitioned with partition_edges and
+    each round is written by `workers` concurrent sessions; a round is the checkpoint unit.
+
+    Returns {entity: {"rows", "seconds", "rows_per_sec"}} for every entity type.
+    """
+    entities = graph_entities(tech_df, paper_df, edge_df, startups_df, matches_df, startup_skills_df, LOAD_SKILLS,
+                              paper_authors_df)
+    stats = {}
+
+    def _record(entity, rows, message, start):
+        seconds = time.perf_counter() - start
+        stats[entity] = {
+            "rows": len(rows),
+            "seconds": seconds,
+            "rows_per_sec": len(rows) / seconds if seconds else float("inf"),
+        }
+        print(f"   ✓ {message.format(n=len(rows))}")
 
     def _tx_load(tx):
-        # Create constraints
-        # tx.run("CREATE CONSTRAINT IF NOT EXISTS FOR (t:Technology) REQUIRE t.tech_id IS UNIQUE")
-        # tx.run("CREATE CONSTRAINT IF NOT EXISTS FOR (p:Paper) REQUIRE p.paper_id IS UNIQUE")
-        # tx.run("CREATE CONSTRAINT IF NOT EXISTS FOR (s:Startup) REQUIRE s.name IS UNIQUE")
-        # tx.run("CREATE CONSTRAINT IF NOT EXISTS FOR (sk:Skill) REQUIRE sk.name IS UNIQUE")
-
-        # Load Technologies
-        for _, r in tech_df.iterrows(): 
-            tx.run("""
-                MERGE (t:Technology {tech_id:$qid})
-                SET t.tech=$name,
-                    t.name=$label,
-                    t.description=$desc
-            """, qid=r.qid, label=r.label, name=r.name, desc=r.description)
-
-        print(f"   ✓ Loaded {len(tech_df)} Technology nodes")
-
-        # Paper nodes
-        for _, r in paper_df.iterrows():
-            tx.run("""
-                MERGE (p:Paper {paper_id:$pid})
-                SET p.arxiv_url=$url,
-                    p.title=$title,
-                    p.summary=$summary,
-                    p.published=date($pub)
-            """, pid=r.paper_id, url=r.id, title=r.title,
-                 summary=r.summary, pub=r.published.date().isoformat())
-
-        print(f"   ✓ Loaded {len(paper_df)} Paper nodes")
-
-        # Paper to Technology edges
-        for _, r in edge_df.iterrows():
-            tx.run("""
-                MATCH (p:Paper {paper_id:$pid})
-                MATCH (t:Technology {tech_id:$qid})
-                MERGE (p)-[:MENTIONS]->(t)
-            """, pid=r.paper_id, qid=r.qid)
-        print(f"   ✓ Created {len(edge_df)} Paper-Technology relationships")
-
-        # Startup nodes
-        for _, row in startups_df.iterrows():
-            original_name = row['original_name_cb_info'] if pd.notnull(row.get('original_name_cb_info')) and row['original_name_cb_info'] else row.get('original_name_yc', '')
-            name = row['name'].strip()
-            # Handle for unkown locations
-            region_value = row.get('region', '')
-            location_value = row.get('location_extracted', '')
-            region = region_value if location_value else "Unknown"
-
-            tx.run("""
-                MERGE (s:Startup {name: $name})
-                SET s.original_name = $original_name, 
-                   s.description = $about + '. ' + $desc,
-                    s.industries = $industries,
-                    s.region = $region,
-                    s.website = $website,
-                    s.homepage = $homepage,
-                    s.founded_date = date($founded_date),
-                    s.num_employees = $num_employees,
-                    s.funding_total = $funding_total,
-                    s.funding_currency = $funding_currency,
-                    s.operating_status = $operating_status,
-                    s.company_type = $company_type,
-                    s.location = $location,
-                    s.status = $status,
-                    s.category = $category
-            """, name=name,
-                original_name=original_name,
-                desc=row.get('long_description', ''),
-                about=row.get('about', ''),
-                industries=row.get('industries', ''),
-                region=region,
-                website=row.get('website', ''),
-                homepage=row.get('homepage_url', ''),
-                founded_date=row['founded_date_parsed'].date().isoformat() if pd.notnull(row['founded_date_parsed']) else None,
-                num_employees=row.get('num_employees', ''),
-                funding_total=row.get('funding_total_usd', 0) if pd.notnull(row.get('funding_total_usd', None)) else None,
-                funding_currency=row.get('funding_currency', ''),
-                operating_status=row.get('operating_status', ''),
-                company_type=row.get('company_type', ''),
-                location=location_value,
-                status=row.get('status', ''),
-                category=row.get('category_list', '')
-                )
-        print(f"   ✓ Loaded {len(startups_df)} Startup nodes from ALL startups")
-
-
-        # Startup to Technology edges
-        for _, match in matches_df.iterrows():
-            startup_name = match['startup_name'].strip()
-            tx.run("""
-                MATCH (s:Startup {name: $startup_name})
-                MATCH (t:Technology {tech_id: $qid})
-                MERGE (s)-[:USES]->(t)
-            """, startup_name=startup_name, qid=match.qid)
-        print(f"   ✓ Created {len(matches_df)} Startup-Technology relationships")
-
-
-        if LOAD_SKILLS:
-            # Load Skill nodes
-            skills_query = """
-            UNWIND $rows AS row
-            MERGE (s:Skill {name: row.skill_clean})
-            """
-            tx.run(skills_query, rows=startup_skills_df.to_dict('records'))
-            print(f"   ✓ Loaded {len(startup_skills_df['skill_clean'].unique())} Skill nodes")
-
-            # Create Startup-HAS_SKILL-Skill relationships
-            skill_edges_query = """
-            UNWIND $rows AS row
-            MATCH (st:Startup {name: row.start_up})
-            MATCH (sk:Skill {name: row.skill_clean})
-            MERGE (st)-[:HAS_SKILL]->(sk)
-            """
-            tx.run(skill_edges_query, rows=startup_skills_df.to_dict('records'))
-            print(f"   ✓ Created {len(startup_skills_df)} Startup-HAS_SKILL-Skill relationships")
-        
+        for entity, query, rows, message in entities:
+            start = time.perf_counter()
+            with measure(f"load_graph.{entity}", rows_in=len(rows)) as rec:
+                for batch in _chunks(rows, batch_size):
+                    _run_batch(tx, query, batch)
+                rec["rows_out"] = len(rows)
+            _record(entity, rows, message, start)
+
+    driver = get_driver()
+    if chunked and workers + 1 > MAX_POOL_SIZE:
+        # The edge writers and the main session each hold a connection
+        print(f"   NOTICE: {workers} load workers share a pool of {MAX_POOL_SIZE} connections; "
+              f"raise NEO4J_MAX_POOL_SIZE to at least {workers + 1}")
+    if schema:
+        ensure_schema(driver)
+        for entity, query, _, _ in entities:
+            if "MATCH" in query and not uses_index_seek(driver, query):
+                print(f"   NOTICE: {entity} lookups are not planned as index seeks")
 
     with driver.session() as sess:
-        sess.execute_write(_tx_load)
-    driver.close()
+        if not chunked:
+            sess.execute_write(_tx_load)
+        else:
+            fingerprint = _fingerprint(entities, batch_size, workers)
+            committed = _read_load_state(state_file, fingerprint)
+            if committed:
+                print(f"   NOTICE: Resuming load from checkpoint {state_file}")
+            pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+            try:
+                for entity, query, rows, message in entities:
+                    start = time.perf_counter()
+                    done = committed.get(entity, 0)
+                    with measure(f"load_graph.{entity}", rows_in=len(rows)) as rec:
+                        if pool and entity in EDGE_ENDPOINTS:
+                            rounds = partition_edges(rows, *EDGE_ENDPOINTS[entity], workers)
+                            for cells in rounds[done:]:
+                                list(pool.map(lambda cell: _write_cell(driver, query, cell, batch_size), filter(None, cells)))
+                                done += 1
+                                committed[entity] = done
+                                _write_load_state(state_file, fingerprint, committed)
+                        else:
+                            for batch in _chunks(islice(rows, done * batch_size, None), batch_size):
+                                sess.execute_write(_run_batch, query, batch)
+                                done += 1
+                                committed[entity] = done
+                                _write_load_state(state_file, fingerprint, committed)
+                        rec["rows_out"] = len(rows)
+                    _record(entity, rows, message, start)
+            finally:
+                if pool:
+                    # When a cell write fails, the cells not started yet are cancelled
+                    pool.shutdown(cancel_futures=True)
+            # Load finished, the next run starts from scratch
+            if os.path.exists(state_file):
+                os.remove(state_file)
+    if schema:
+        report_index_usage(driver)
+    report_pool_metrics()
+    return stats
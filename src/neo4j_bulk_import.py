@@ -0,0 +1,135 @@
+"""
+Offline bulk import: an alternative to load_graph for building a fresh database.
+
+write_import_files turns the same load plan as load_graph (graph_entities) into one
+header-annotated CSV per node label and relationship type, plus an argument file for
+
+    neo4j-admin database import full @<import dir>/import.args
+
+The importer writes the store files directly, so a full rebuild is bounded by disk
+throughput instead of by transactions. It needs the database to be offline; with Docker:
+
+    docker compose stop neo4j
+    docker compose --profile bulk-import run --rm neo4j-import
+    docker compose start neo4j
+    python -m src.neo4j_bulk_import schema   # constraints and indexes, once the server is up
+
+Node IDs are the stable keys the Cypher loader merges on (qid, paper_id, author_id,
+startup_id, skill name), so both loaders produce the same graph.
+"""
+
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+
+import pandas as pd
+
+from src.load_to_neo4j import graph_entities
+
+# Where the files are written, and where neo4j-admin sees them (the neo4j-import service mounts it at /import)
+IMPORT_DIR = os.getenv("NEO4J_IMPORT_DIR", "data/neo4j_import")
+IMPORT_PATH = os.getenv("NEO4J_IMPORT_PATH", "/import")
+NEO4J_ADMIN = os.getenv("NEO4J_ADMIN", "neo4j-admin")
+IMPORT_DATABASE = os.getenv("NEO4J_IMPORT_DATABASE", "neo4j")
+
+# entity -> [(row key, header field)]; properties and types follow the Cypher queries in load_to_neo4j.
+# Integer IDs are also stored as long properties, string IDs are stored by the :ID field itself.
+NODE_HEADERS = {
+    "Technology": [("qid", "tech_id:ID(Technology)"), ("name", "tech"), ("label", "name"),
+                   ("description", "description")],
+    "Paper": [("paper_id", "paper_id:ID(Paper)"), ("id", "arxiv_url"), ("title", "title"),
+              ("summary", "summary"), ("published", "published:date")],
+    "Author": [("author_id", ":ID(Author)"), ("author_id", "author_id:long"), ("name", "name")],
+    "Startup": [("startup_id", ":ID(Startup)"), ("startup_id", "startup_id:long"), ("name", "name"),
+                ("original_name", "original_name"), ("description", "description"),
+                ("industries", "industries"), ("region", "region"), ("website", "website"),
+                ("homepage", "homepage"), ("founded_date", "founded_date:date"),
+                ("num_employees", "num_employees"), ("funding_total", "funding_total:double"),
+                ("funding_currency", "funding_currency"), ("operating_status", "operating_status"),
+                ("company_type", "company_type"), ("location", "location"), ("status", "status"),
+                ("category", "category")],
+    "Skill": [("skill_clean", "name:ID(Skill)")],
+}
+
+RELATIONSHIP_HEADERS = {
+    "MENTIONS": [("paper_id", ":START_ID(Paper)"), ("qid", ":END_ID(Technology)")],
+    "AUTHORED": [("author_id", ":START_ID(Author)"), ("paper_id", ":END_ID(Paper)")],
+    "USES": [("startup_id", ":START_ID(Startup)"), ("qid", ":END_ID(Technology)")],
+    "HAS_SKILL": [("startup_id", ":START_ID(Startup)"), ("skill_clean", ":END_ID(Skill)")],
+}
+
+
+def _import_frame(rows, headers):
+    records = pd.DataFrame.from_records(rows, columns=list(dict.fromkeys(key for key, _ in headers)))
+    return pd.DataFrame({header: records[key] for key, header in headers})
+
+
+def write_import_files(tech_df, paper_df, edge_df, startups_df, matches_df, startup_skills_df, LOAD_SKILLS=False,
+                       paper_authors_df=None, import_dir=IMPORT_DIR, import_path=IMPORT_PATH,
+                       database=IMPORT_DATABASE):
+    """
+    Writes <entity>.csv for every node and edge type of the load plan and the import.args
+    file, whose file paths point into import_path (the import dir as neo4j-admin sees it).
+
+    The importer does not MERGE, so rows are deduplicated here the way MERGE would: the
+    last row of a node ID wins and repeated relationships are written once. Relationships
+    to missing nodes are skipped by the importer, like the MATCH in the Cypher loader.
+    Returns the path of the argument file.
+    """
+    os.makedirs(import_dir, exist_ok=True)
+    args = [
+        database,
+        "--overwrite-destination=true",
+        "--skip-duplicate-nodes=true",
+        "--skip-bad-relationships=true",
+        "--multiline-fields=true",
+    ]
+    entities = graph_entities(tech_df, paper_df, edge_df, startups_df, matches_df, startup_skills_df, LOAD_SKILLS,
+                              paper_authors_df)
+    for entity, _, rows, message in entities:
+        if entity in NODE_HEADERS:
+            frame = _import_frame(rows, NODE_HEADERS[entity])
+            frame = frame.drop_duplicates(subset=frame.columns[0], keep="last")
+            option = "--nodes"
+        else:
+            frame = _import_frame(rows, RELATIONSHIP_HEADERS[entity]).drop_duplicates()
+            option = "--relationships"
+        file_name = f"{entity.lower()}.csv"
+        frame.to_csv(os.path.join(import_dir, file_name), index=False)
+        args.append(f"{option}={entity}={import_path.rstrip('/')}/{file_name}")
+        print(f"   ✓ {message.format(n=len(frame))} (import file)")
+
+    args_path = os.path.join(import_dir, "import.args")
+    with open(args_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(args) + "\n")
+    print(f"   ✓ Import files written to {import_dir}")
+    return args_path
+
+
+def run_import(import_dir=IMPORT_DIR, neo4j_admin=NEO4J_ADMIN):
+    """
+    Runs neo4j-admin on the written files when it is installed here (with NEO4J_IMPORT_PATH
+    set to the absolute path of the import dir). Otherwise prints how to run it in the
+    neo4j-import container and returns False.
+    """
+    command = shlex.split(neo4j_admin)
+    if shutil.which(command[0]) is None:
+        print(f"   NOTICE: {command[0]} is not available here. Stop Neo4j and run the import with:\n"
+              f"      docker compose stop neo4j && docker compose --profile bulk-import run --rm neo4j-import "
+              f"&& docker compose start neo4j")
+        return False
+    args_file = os.path.join(import_dir, "import.args")
+    subprocess.run(command + ["database", "import", "full", f"@{args_file}"], check=True)
+    print("   ✓ neo4j-admin import finished")
+    return True
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["schema"]:
+        sys.exit("usage: python -m src.neo4j_bulk_import schema")
+    from src.neo4j_connection import wait_until_ready
+    from src.neo4j_schema import ensure_schema
+
+    ensure_schema(wait_until_ready())
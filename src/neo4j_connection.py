@@ -0,0 +1,149 @@
+"""
+One shared, configured Neo4j driver for the schema, load, sync and query steps.
+
+The driver and its connection pool are created on first use by get_driver and closed at
+exit. Pool size, acquisition timeout, connection lifetime and keep-alive come from the
+environment, so the pool can be sized for the parallel edge writers (NEO4J_LOAD_WORKERS
+sessions at a time). wait_until_ready blocks until the server answers, backing off
+exponentially, and pool_metrics reports how busy the pool got at its peak.
+"""
+
+import atexit
+import os
+import threading
+import time
+
+from neo4j import GraphDatabase
+from neo4j.exceptions import ServiceUnavailable, SessionExpired
+
+URI = os.getenv("NEO4J_URI", "bolt://neo4j:7687")   # default works in Docker network
+USER = os.getenv("NEO4J_USER", "neo4j")
+PWD  = os.getenv("NEO4J_PASSWORD", "password")
+MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "16"))
+# Seconds a session waits for a free connection before failing
+ACQUISITION_TIMEOUT = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "60"))
+MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+KEEP_ALIVE = os.getenv("NEO4J_KEEP_ALIVE", "true").lower() in ("1", "true", "yes", "y")
+READY_TIMEOUT = float(os.getenv("NEO4J_READY_TIMEOUT", "120"))
+
+_driver = None
+_lock = threading.Lock()
+_acquire_stats = {"count": 0, "total_s": 0.0, "max_s": 0.0, "peak_in_use": 0}
+
+
+def _connections_in_use(pool):
+    """(in use, idle) connections of the pool, or (None, None) when it cannot be inspected."""
+    connections = getattr(pool, "connections", None)
+    if connections is None:
+        return None, None
+    all_connections = [c for per_address in list(connections.values()) for c in list(per_address)]
+    in_use = sum(1 for c in all_connections if getattr(c, "in_use", False))
+    return in_use, len(all_connections) - in_use
+
+
+def _time_acquisitions(pool):
+    """
+    Wraps the pool's acquire to record how long sessions wait for a connection and how many
+    connections are in use right after each acquisition, so the peaks are known once the
+    sessions have closed again.
+
+    The wait and peak numbers depend on patching driver._pool.acquire, which is private driver
+    API (checked against neo4j 5.19): when the pool or its acquire is missing the patch is
+    skipped and the metrics stay at zero.
+    """
+    acquire = getattr(pool, "acquire", None)
+    if acquire is None:
+        return
+
+    def timed_acquire(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return acquire(*args, **kwargs)
+        finally:
+            waited = time.perf_counter() - start
+            in_use, _ = _connections_in_use(pool)
+            with _lock:
+                _acquire_stats["count"] += 1
+                _acquire_stats["total_s"] += waited
+                _acquire_stats["max_s"] = max(_acquire_stats["max_s"], waited)
+                _acquire_stats["peak_in_use"] = max(_acquire_stats["peak_in_use"], in_use or 0)
+
+    pool.acquire = timed_acquire
+
+
+def get_driver():
+    """The shared driver, created with the pool settings above on first use."""
+    global _driver
+    with _lock:
+        if _driver is None:
+            _driver = GraphDatabase.driver(
+                URI, auth=(USER, PWD),
+                max_connection_pool_size=MAX_POOL_SIZE,
+                connection_acquisition_timeout=ACQUISITION_TIMEOUT,
+                max_connection_lifetime=MAX_CONNECTION_LIFETIME,
+                keep_alive=KEEP_ALIVE,
+            )
+            _time_acquisitions(getattr(_driver, "_pool", None))
+        return _driver
+
+
+def close_driver():
+    global _driver
+    with _lock:
+        if _driver is not None:
+            _driver.close()
+            _driver = None
+
+
+atexit.register(close_driver)
+
+
+def wait_until_ready(timeout=READY_TIMEOUT, initial_delay=0.5, max_delay=8.0):
+    """
+    Blocks until the server accepts connections, retrying with exponential backoff
+    (initial_delay, doubling up to max_delay) for at most `timeout` seconds. Reuses the
+    shared driver instead of opening one per attempt; authentication errors are not retried.
+    """
+    driver = get_driver()
+    deadline = time.monotonic() + timeout
+    delay, attempt = initial_delay, 1
+    while True:
+        try:
+            driver.verify_connectivity()
+            print("✓ Neo4j is ready!")
+            return driver
+        except (ServiceUnavailable, SessionExpired, OSError) as e:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RuntimeError(f"Neo4j did not become ready within {timeout:.0f}s: {e}") from e
+            wait = min(delay, max_delay, remaining)
+            print(f"Waiting for Neo4j to be ready... (attempt {attempt}, retrying in {wait:.1f}s)")
+            time.sleep(wait)
+            delay, attempt = delay * 2, attempt + 1
+
+
+def pool_metrics():
+    """
+    Connections in use and idle now (None when the pool cannot be inspected), the peak number
+    in use at any acquisition, and the number of connection acquisitions with their average
+    and maximum wait, since the driver was created.
+    """
+    in_use, idle = _connections_in_use(getattr(_driver, "_pool", None))
+    with _lock:
+        stats = dict(_acquire_stats)
+    return {
+        "max_size": MAX_POOL_SIZE,
+        "in_use": in_use,
+        "idle": idle,
+        "peak_in_use": stats["peak_in_use"],
+        "acquisitions": stats["count"],
+        "acquire_wait_avg_ms": 1000 * stats["total_s"] / stats["count"] if stats["count"] else 0.0,
+        "acquire_wait_max_ms": 1000 * stats["max_s"],
+    }
+
+
+def report_pool_metrics():
+    m = pool_metrics()
+    print(f"   Connection pool: peak {m['peak_in_use']} in use of max {m['max_size']} ({m['idle']} idle now); "
+          f"{m['acquisitions']} acquisitions, wait avg {m['acquire_wait_avg_ms']:.1f} ms, "
+          f"peak {m['acquire_wait_max_ms']:.1f} ms")
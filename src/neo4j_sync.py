@@ -0,0 +1,165 @@
+"""
+Differential sync: an alternative to load_graph for refreshing an existing graph.
+
+The state of the last successful sync (one content hash per node and one entry per edge,
+for every entity of the load plan) is kept in SYNC_STATE_FILE. A sync hashes the rows of
+the current load plan, diffs them against that state locally and only sends the changes:
+new or changed nodes and new edges go through the usual MERGE queries, nodes and edges
+that disappeared (e.g. a match that fell below its threshold) are deleted.
+
+The state describes what this module wrote, so a graph that was also written otherwise
+(load_graph, the bulk importer) should be synced once without state (delete the file):
+that first sync upserts every row, like load_graph.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+from src.cache import atomic_write
+from src.instrumentation import measure
+from src.load_to_neo4j import BATCH_SIZE, EDGE_ENDPOINTS, graph_entities, _chunks, _run_batch
+from src.neo4j_connection import get_driver, report_pool_metrics
+from src.neo4j_schema import ensure_schema
+
+SYNC_STATE_FILE = os.getenv("NEO4J_SYNC_STATE", "data/.neo4j_sync_state.parquet")
+
+# Node label -> (row key, node property) of the key the node is merged on
+NODE_KEYS = {
+    "Technology": ("qid", "tech_id"),
+    "Paper": ("paper_id", "paper_id"),
+    "Author": ("author_id", "author_id"),
+    "Startup": ("startup_id", "startup_id"),
+    "Skill": ("skill_clean", "name"),
+}
+
+# Edge type -> (start label, end label); the row keys are in EDGE_ENDPOINTS
+EDGE_NODES = {
+    "MENTIONS": ("Paper", "Technology"),
+    "AUTHORED": ("Author", "Paper"),
+    "USES": ("Startup", "Technology"),
+    "HAS_SKILL": ("Startup", "Skill"),
+}
+
+
+def _delete_query(entity):
+    if entity in NODE_KEYS:
+        return f"UNWIND $rows AS row MATCH (n:{entity} {{{NODE_KEYS[entity][1]}: row.key[0]}}) DETACH DELETE n"
+    start, end = EDGE_NODES[entity]
+    return (f"UNWIND $rows AS row "
+            f"MATCH (a:{start} {{{NODE_KEYS[start][1]}: row.key[0]}})-[r:{entity}]->"
+            f"(b:{end} {{{NODE_KEYS[end][1]}: row.key[1]}}) DELETE r")
+
+
+def _key_fields(entity):
+    return [NODE_KEYS[entity][0]] if entity in NODE_KEYS else list(EDGE_ENDPOINTS[entity])
+
+
+def _row_hash(row):
+    return hashlib.blake2b(json.dumps(row, sort_keys=True, default=str).encode(), digest_size=8).hexdigest()
+
+
+def read_sync_state(path=SYNC_STATE_FILE):
+    """entity, key (JSON list of the key values), hash of every row written by the last sync."""
+    if path and os.path.exists(path):
+        return pd.read_parquet(path)
+    return pd.DataFrame(columns=["entity", "key", "hash"], dtype=object)
+
+
+def _write_sync_state(state, path):
+    with atomic_write(path) as tmp_path:
+        state.to_parquet(tmp_path, index=False)
+
+
+def diff_entity(entity, rows, old_state, resend=()):
+    """
+    Returns (upsert rows, deleted keys, new state, created keys) of one entity. Rows sharing
+    a key collapse to the last one, as repeated MERGE ... SET would. Rows at the positions
+    in `resend` are upserted even when unchanged; created keys are the key values of rows
+    that were not in the old state.
+    """
+    fields = _key_fields(entity)
+    current = pd.DataFrame({
+        "key": pd.Series([json.dumps([row[f] for f in fields], default=str) for row in rows], dtype=object),
+        "hash": pd.Series([_row_hash(row) for row in rows], dtype=object),
+        "position": range(len(rows)),
+    }).drop_duplicates("key", keep="last")
+    merged = current.merge(old_state[["key", "hash"]], on="key", how="outer", suffixes=("", "_old"), indicator=True)
+    created = merged["_merge"] == "left_only"
+    changed = merged[created | ((merged["_merge"] == "both") & (merged["hash"] != merged["hash_old"]))
+                     | merged["position"].isin(list(resend))]
+    deleted = merged.loc[merged["_merge"] == "right_only", "key"]
+
+    upserts = [rows[int(i)] for i in changed["position"].sort_values()]
+    created_keys = {rows[int(i)][fields[0]] for i in merged.loc[created, "position"]}
+    new_state = current[["key", "hash"]].assign(entity=entity)[["entity", "key", "hash"]]
+    return upserts, [json.loads(k) for k in deleted], new_state, created_keys
+
+
+def sync_graph(tech_df, paper_df, edge_df, startups_df, matches_df, startup_skills_df, LOAD_SKILLS=False,
+               paper_authors_df=None, batch_size=BATCH_SIZE, state_file=SYNC_STATE_FILE, schema=True):
+    """
+    Writes only the difference between the current load plan and the last synced state.
+
+    Upserts run in load plan order (nodes before the edges that MATCH them), deletes in
+    reverse order (edges before their nodes). Entities missing from the plan (skills when
+    LOAD_SKILLS is off) keep their state and are not touched. The state is saved after
+    all changes are committed; if a sync fails the next one sends the same diff again,
+    which is safe because every write is a MERGE or a DELETE.
+
+    Returns {entity: {"upserts", "deletes", "unchanged", "seconds"}}.
+    """
+    entities = graph_entities(tech_df, paper_df, edge_df, startups_df, matches_df, startup_skills_df, LOAD_SKILLS,
+                              paper_authors_df)
+    old_state = read_sync_state(state_file)
+    if old_state.empty:
+        print("   NOTICE: No sync state, every row is sent")
+
+    plan, states = [], []
+    # label -> keys of the nodes this sync creates. Edges to them are resent even if unchanged:
+    # while the node was missing (or deleted with its edges) their MATCH wrote nothing.
+    created = {}
+    for entity, query, rows, _ in entities:
+        resend = []
+        if entity in EDGE_NODES:
+            (start_key, end_key), (start_label, end_label) = EDGE_ENDPOINTS[entity], EDGE_NODES[entity]
+            new_start, new_end = created.get(start_label, set()), created.get(end_label, set())
+            resend = [i for i, row in enumerate(rows) if row[start_key] in new_start or row[end_key] in new_end]
+        upserts, deletes, new_state, created[entity] = diff_entity(
+            entity, rows, old_state[old_state["entity"] == entity], resend)
+        plan.append((entity, query, upserts, deletes, len(new_state) - len(upserts)))
+        states.append(new_state)
+    synced = [entity for entity, *_ in entities]
+    states.append(old_state[~old_state["entity"].isin(synced)])
+
+    driver = get_driver()
+    if schema:
+        ensure_schema(driver)
+
+    stats = {}
+    with driver.session() as sess:
+        for entity, query, upserts, _, unchanged in plan:
+            start = time.perf_counter()
+            with measure(f"sync_graph.{entity}.upsert", rows_in=len(upserts)) as rec:
+                for batch in _chunks(upserts, batch_size):
+                    sess.execute_write(_run_batch, query, batch)
+                rec["rows_out"] = len(upserts)
+            stats[entity] = {"upserts": len(upserts), "unchanged": unchanged, "seconds": time.perf_counter() - start}
+        for entity, _, _, deletes, _ in reversed(plan):
+            start = time.perf_counter()
+            with measure(f"sync_graph.{entity}.delete", rows_in=len(deletes)) as rec:
+                for batch in _chunks(({"key": key} for key in deletes), batch_size):
+                    sess.execute_write(_run_batch, _delete_query(entity), batch)
+                rec["rows_out"] = len(deletes)
+            stats[entity]["deletes"] = len(deletes)
+            stats[entity]["seconds"] += time.perf_counter() - start
+    report_pool_metrics()
+
+    if state_file:
+        _write_sync_state(pd.concat(states, ignore_index=True), state_file)
+    for entity, s in stats.items():
+        print(f"   ✓ {entity}: {s['upserts']} upserted, {s['deletes']} deleted, {s['unchanged']} unchanged")
+    return stats
@@ -0,0 +1,266 @@
+"""
+Minimal stage DAG for the pipeline.
+
+A stage declares the cache artifacts it reads (inputs) and writes (outputs); the edges of the
+DAG follow from which stage produces which artifact. Stages exchange data only through those
+artifacts, so independent stages can run concurrently in a process pool.
+
+A stage is skipped when its outputs exist and its key (code, including the src modules it
+calls into, params and the content hash of every input) matches the one recorded after its
+last successful run in PIPELINE_STATE_FILE.
+Source stages (fetchers) have no inputs and only run when their outputs are missing or forced.
+Outputs without a recorded key (shipped with the repo, or written before the runner tracked
+them) are adopted only when no upstream stage ran in the same invocation and they are newer
+than every input.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from src.cache import parquet_path, artifact_rows, atomic_write
+from src.instrumentation import measure, collect, add_records
+
+PIPELINE_STATE_FILE = os.getenv("PIPELINE_STATE", "data/.pipeline_state.json")
+# Most stages wait on the network or on disk, so this is not tied to the CPU count
+PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", "4"))
+
+
+class Stage:
+    """
+    func(**params) runs the stage. in_process stages (interactive ones, or those that talk to
+    Neo4j) run in the main process instead of the pool. Stages without outputs always run.
+    """
+
+    def __init__(self, name, func, inputs=(), outputs=(), params=None, source=False, in_process=False):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.params = params or {}
+        self.source = source
+        self.in_process = in_process
+
+
+def _artifact_files(path):
+    return [p for p in dict.fromkeys((path, parquet_path(path))) if os.path.exists(p)]
+
+
+def artifact_exists(path):
+    return bool(_artifact_files(path))
+
+
+def _file_digest(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _func_source(func):
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return f"{func.__module__}.{func.__qualname__}"
+
+
+def _src_module(obj):
+    """Name of the src package module obj is (or was defined in), else None."""
+    name = obj.__name__ if inspect.ismodule(obj) else getattr(obj, "__module__", None)
+    return name if isinstance(name, str) and name.startswith("src.") else None
+
+
+def _src_dependencies(func):
+    """
+    The src modules func calls into, followed through their own src imports. Only names the
+    function's code refers to are followed from its globals; within src every import counts.
+    """
+    found, pending = set(), []
+    for name in func.__code__.co_names:
+        module = _src_module(func.__globals__.get(name))
+        if module:
+            pending.append(module)
+    while pending:
+        module = pending.pop()
+        if module in found or module not in sys.modules:
+            continue
+        found.add(module)
+        pending += [m for m in map(_src_module, vars(sys.modules[module]).values()) if m]
+    return sorted(found)
+
+
+def stage_key(stage):
+    """
+    Hash of the stage's code, params and the current content of its inputs. The code is the
+    stage function plus the source files of the src modules it depends on, so editing e.g.
+    clean_data.py reruns the stages that call into it.
+    """
+    h = hashlib.sha1()
+    h.update(stage.name.encode())
+    h.update(_func_source(stage.func).encode())
+    for module in _src_dependencies(stage.func):
+        path = getattr(sys.modules[module], "__file__", None)
+        if path and os.path.exists(path):
+            h.update(module.encode())
+            h.update(_file_digest(path).encode())
+    h.update(json.dumps(stage.params, sort_keys=True, default=str).encode())
+    for path in stage.inputs:
+        h.update(path.encode())
+        for file in _artifact_files(path):
+            h.update(_file_digest(file).encode())
+    return h.hexdigest()
+
+
+def _read_state(path):
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def _write_state(state, path):
+    with atomic_write(path) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+
+
+def upstream(stages):
+    """stage name -> names of the stages producing its inputs."""
+    producers = {out: s.name for s in stages for out in s.outputs}
+    return {s.name: {producers[i] for i in s.inputs if i in producers} for s in stages}
+
+
+def downstream_of(stages, names):
+    """The given stages and everything that (transitively) depends on them."""
+    deps = upstream(stages)
+    selected = set(names)
+    changed = True
+    while changed:
+        changed = False
+        for s in stages:
+            if s.name not in selected and deps[s.name] & selected:
+                selected.add(s.name)
+                changed = True
+    return selected
+
+
+def _sum_rows(paths):
+    counts = [artifact_rows(p) for p in paths]
+    counts = [c for c in counts if c is not None]
+    return sum(counts) if counts else None
+
+
+def _run_stage(stage):
+    """
+    Runs one stage under instrumentation and returns its result with the records of this
+    process, so records measured in pool workers reach the main process.
+    """
+    with measure(f"stage.{stage.name}", rows_in=_sum_rows(stage.inputs)) as record:
+        result = stage.func(**stage.params)
+    record["rows_out"] = _sum_rows(stage.outputs)
+    return result, collect()
+
+
+def _mtimes(paths):
+    return [os.path.getmtime(f) for p in paths for f in _artifact_files(p)]
+
+
+def _decide(stage, state, forced, upstream_ran=False):
+    """Returns (run, key, reason). upstream_ran: a stage producing one of its inputs ran in this invocation."""
+    if stage.name in forced:
+        return True, None, "forced"
+    if not stage.outputs:
+        return True, None, "no outputs"
+    missing = [p for p in stage.outputs if not artifact_exists(p)]
+    if missing:
+        return True, None, f"missing {', '.join(missing)}"
+    if stage.source:
+        return False, None, "cached"
+    key = stage_key(stage)
+    if stage.name not in state:
+        # Outputs exist from before the runner tracked them: adopt them as up to date, unless
+        # an input was just rewritten or is newer than the outputs
+        if upstream_ran:
+            return True, None, "untracked outputs, upstream stage ran"
+        if max(_mtimes(stage.inputs), default=0) > min(_mtimes(stage.outputs)):
+            return True, None, "untracked outputs older than inputs"
+        return False, key, "adopted existing outputs"
+    if state[stage.name] != key:
+        return True, None, "inputs or code changed"
+    return False, key, "up to date"
+
+
+def run_stages(stages, only=None, start=None, force=(), workers=PIPELINE_WORKERS, state_file=PIPELINE_STATE_FILE):
+    """
+    Runs the DAG. only=[names] runs just those stages, start=name reruns that stage and
+    everything downstream of it; both force the selected stages to run. force=[names]
+    forces stages within a full run. Returns {stage name: return value of its func}.
+    Each stage that runs is measured with src.instrumentation, including the steps inside it.
+    """
+    by_name = {s.name: s for s in stages}
+    for name in list(only or []) + ([start] if start else []) + list(force):
+        if name not in by_name:
+            raise ValueError(f"Unknown stage '{name}'. Stages: {', '.join(by_name)}")
+
+    forced = set(force)
+    if only:
+        selected = set(only)
+        forced |= selected
+    elif start:
+        selected = downstream_of(stages, [start])
+        forced |= selected
+    else:
+        selected = set(by_name)
+
+    deps = {name: d & selected for name, d in upstream(stages).items() if name in selected}
+    state = _read_state(state_file)
+    done, ran, results, running = set(), set(), {}, {}
+
+    def _finish(name, key, outcome=None):
+        result, records = outcome or (None, [])
+        add_records(records)
+        done.add(name)
+        if outcome is not None:
+            ran.add(name)
+        results[name] = result
+        state[name] = key if key is not None else stage_key(by_name[name])
+        if state_file:
+            _write_state(state, state_file)
+
+    decisions = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while len(done) < len(selected):
+            progressed = False
+            for stage in stages:
+                if (stage.name not in selected or stage.name in done or stage.name in running.values()
+                        or not deps[stage.name] <= done):
+                    continue
+                if stage.name not in decisions:
+                    decisions[stage.name] = _decide(stage, state, forced, bool(deps[stage.name] & ran))
+                run, key, reason = decisions[stage.name]
+                if not run:
+                    print(f"   ✓ [{stage.name}] skipped ({reason})")
+                    _finish(stage.name, key)
+                    progressed = True
+                elif not stage.in_process:
+                    print(f"\n>> [{stage.name}] running ({reason})")
+                    running[pool.submit(_run_stage, stage)] = stage.name
+                elif not running:
+                    # In-process stages wait for the pool to drain, so their output is not interleaved
+                    print(f"\n>> [{stage.name}] running ({reason})")
+                    _finish(stage.name, None, _run_stage(stage))
+                    progressed = True
+            if progressed:
+                continue
+            if not running:
+                raise RuntimeError("Pipeline DAG has a cycle or an unsatisfiable stage")
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                _finish(name, None, future.result())
+                print(f"   ✓ [{name}] finished")
+    return results
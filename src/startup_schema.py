@@ -0,0 +1,97 @@
+"""
+Column schema of the startup sources.
+
+Only the columns that cleaning, matching and load_graph actually use are read from the
+cached startup tables; everything else in the wide Crunchbase/Brightdata exports is never
+loaded. Low-cardinality labels become categoricals and funding a nullable float.
+
+Startups are identified by their normalized name; startup_ids turns it into a stable int64
+startup_id, which the merges and the Neo4j edge lookups compare instead of the strings.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.cache import read_cache, parquet_path
+
+# source -> columns used downstream (matching text, merge keys, cleaning inputs, Startup properties)
+STARTUP_COLUMNS = {
+    "yc": [
+        "name", "region", "founded", "website",
+        "long_description", "industry", "short_description", "tags",
+    ],
+    "crunchbase": [
+        "name", "country_code", "homepage_url", "category_list", "status",
+        "funding_total_usd", "founded_at", "first_funding_at",
+    ],
+    "cb_info": [
+        "name", "about", "industries", "full_description", "region", "location", "website",
+        "num_employees", "operating_status", "company_type", "founded_date",
+        "funds_total", "financials_highlights", "funding_rounds",
+    ],
+}
+
+CATEGORICAL_COLUMNS = ["region", "country", "status", "operating_status", "company_type", "funding_currency"]
+# Nullable, so missing funding stays <NA> instead of forcing object columns
+NUMERIC_COLUMNS = {"funding_total_usd": "Float64"}
+
+
+def memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def apply_startup_dtypes(df):
+    """Categorical labels and nullable numerics for whichever schema columns df has (in place)."""
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    for col, dtype in NUMERIC_COLUMNS.items():
+        if col in df.columns and pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def _dropped_columns_mb(path, columns):
+    """
+    Memory the cached columns not in `columns` would take as a DataFrame. They are read one at
+    a time, so measuring them never holds the full table.
+    """
+    pq_path = parquet_path(path)
+    dropped = [c for c in pq.read_schema(pq_path).names if c not in columns]
+    return sum(pd.read_parquet(pq_path, columns=[c]).memory_usage(deep=True, index=False).sum()
+               for c in dropped) / 2**20, len(dropped)
+
+
+def read_startups(path, source, **csv_kwargs):
+    """
+    Reads only the STARTUP_COLUMNS of `source` from the cache and reports the memory saved
+    against the full table as the old code read it (every column, as objects).
+    """
+    df = read_cache(path, columns=STARTUP_COLUMNS[source], **csv_kwargs)
+    dropped_mb, n_dropped = _dropped_columns_mb(path, df.columns)
+    before = memory_mb(df) + dropped_mb
+    apply_startup_dtypes(df)
+    print(f"   ✓ {source}: read {len(df.columns)}/{len(df.columns) + n_dropped} columns, "
+          f"{before:.1f} MB for the full table -> {memory_mb(df):.1f} MB typed")
+    return df
+
+
+def normalise_names(names):
+    """
+    Lowercase and drop everything but [a-z0-9]; missing names become "".
+    Each distinct name is normalized once and equal names share one string object.
+    """
+    names = pd.Series(names, copy=False)
+    codes, uniques = pd.factorize(names.astype(object), use_na_sentinel=True)
+    normalised = pd.Series(uniques, dtype=object).astype(str).str.lower().str.replace(r"[^a-z0-9]", "", regex=True)
+    # code -1 (missing) picks the trailing ""
+    values = np.append(normalised.to_numpy(dtype=object), "")
+    return pd.Series(values[codes], index=names.index, dtype=object)
+
+
+def startup_ids(names):
+    """Stable int64 id of each normalized name (the same name always gets the same id, across runs)."""
+    names = pd.Series(names, copy=False)
+    values = names.fillna("").astype(str).to_numpy(dtype=object)
+    return pd.Series(pd.util.hash_array(values).view(np.int64), index=names.index)